@@ -7,7 +7,14 @@ try:
 except importlib.metadata.PackageNotFoundError:
     __version__ = "0.0.0-dev"
 
-mcp = FastMCP(name="aktools-pro", version=__version__)
+# 重复注册同名工具/资源/提示词时直接报错，防止模块被二次导入后静默覆盖
+mcp = FastMCP(
+    name="aktools-pro",
+    version=__version__,
+    on_duplicate_tools="error",
+    on_duplicate_resources="error",
+    on_duplicate_prompts="error",
+)
 
 INSTRUCTIONS = """
 # AkTools Pro - 金融数据分析助手指南
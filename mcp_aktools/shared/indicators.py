@@ -1,30 +1,80 @@
+from .lazy import np, pd
+
+_INDICATOR_NAMES = ["DIF", "DEA", "MACD", "KDJ.K", "KDJ.D", "KDJ.J", "RSI", "BOLL.M", "BOLL.U", "BOLL.L"]
+
+
+def _ewm(values, **kwargs):
+    return pd.Series(values).ewm(adjust=False, **kwargs).mean().to_numpy()
+
+
+def _rolling(values, window, stat, min_periods=None):
+    return getattr(pd.Series(values).rolling(window=window, min_periods=min_periods), stat)().to_numpy()
+
+
 def add_technical_indicators(df, clos, lows, high):
-    # 计算MACD指标
-    ema12 = clos.ewm(span=12, adjust=False).mean()
-    ema26 = clos.ewm(span=26, adjust=False).mean()
-    df["DIF"] = ema12 - ema26
-    df["DEA"] = df["DIF"].ewm(span=9, adjust=False).mean()
-    df["MACD"] = (df["DIF"] - df["DEA"]) * 2
-
-    # 计算KDJ指标
-    low_min = lows.rolling(window=9, min_periods=1).min()
-    high_max = high.rolling(window=9, min_periods=1).max()
-    rsv = (clos - low_min) / (high_max - low_min) * 100
-    df["KDJ.K"] = rsv.ewm(com=2, adjust=False).mean()
-    df["KDJ.D"] = df["KDJ.K"].ewm(com=2, adjust=False).mean()
-    df["KDJ.J"] = 3 * df["KDJ.K"] - 2 * df["KDJ.D"]
-
-    # 计算RSI指标
-    delta = clos.diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
-    rs = avg_gain / avg_loss
-    df["RSI"] = 100 - (100 / (1 + rs))
-
-    # 计算布林带指标
-    df["BOLL.M"] = clos.rolling(window=20).mean()
-    std = clos.rolling(window=20).std()
-    df["BOLL.U"] = df["BOLL.M"] + 2 * std
-    df["BOLL.L"] = df["BOLL.M"] - 2 * std
+    # 逐元素运算在 float64 数组上完成，仅 ewm/rolling 借用 pandas 的 C 实现，最后一次性写入全部指标列
+    close = clos.to_numpy(dtype=np.float64)
+    low = lows.to_numpy(dtype=np.float64)
+    high = high.to_numpy(dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 计算MACD指标
+        dif = _ewm(close, span=12) - _ewm(close, span=26)
+        dea = _ewm(dif, span=9)
+        macd = (dif - dea) * 2
+
+        # 计算KDJ指标
+        low_min = _rolling(low, 9, "min", min_periods=1)
+        high_max = _rolling(high, 9, "max", min_periods=1)
+        rsv = (close - low_min) / (high_max - low_min) * 100
+        kdj_k = _ewm(rsv, com=2)
+        kdj_d = _ewm(kdj_k, com=2)
+        kdj_j = 3 * kdj_k - 2 * kdj_d
+
+        # 计算RSI指标
+        delta = np.empty_like(close)
+        delta[:1] = np.nan
+        delta[1:] = close[1:] - close[:-1]
+        gain = np.where(delta > 0, delta, 0)
+        loss = -np.where(delta < 0, delta, 0)
+        rs = _rolling(gain, 14, "mean") / _rolling(loss, 14, "mean")
+        rsi = 100 - (100 / (1 + rs))
+
+        # 计算布林带指标
+        boll_m = _rolling(close, 20, "mean")
+        std = _rolling(close, 20, "std")
+        boll_u = boll_m + 2 * std
+        boll_l = boll_m - 2 * std
+
+    df[_INDICATOR_NAMES] = np.column_stack([dif, dea, macd, kdj_k, kdj_d, kdj_j, rsi, boll_m, boll_u, boll_l])
+
+
+def latch_positions(enter, exit):
+    # 持仓状态机的向量化实现：满足进场条件置 1，满足离场条件置 0（进场优先），
+    # 其余位置沿用上一状态，初始为空仓
+    state = enter.astype(float).where(enter | exit)
+    return state.ffill().fillna(0).astype(int)
+
+
+def backtest_metrics(close, signal):
+    # 多/空仓信号的回测指标：按上一根K线的信号持有下一根的收益，
+    # 返回 (累计收益, 最大回撤, 胜率)，语义与 pct_change().fillna(0) + cumprod/cummax 版本一致
+    close = np.asarray(close, dtype=np.float64)
+    position = np.asarray(signal, dtype=np.float64)
+    returns = np.zeros_like(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = close[1:] / close[:-1] - 1
+    returns[np.isnan(returns)] = 0
+    strat_returns = np.zeros_like(close)
+    # 价格为 0 时会出现 inf/nan，与 pandas 一样静默传播
+    with np.errstate(invalid="ignore"):
+        strat_returns[1:] = returns[1:] * position[:-1]
+        invalid = np.isnan(strat_returns)
+        equity = np.cumprod(1 + np.where(invalid, 0, strat_returns))
+        equity[invalid] = np.nan
+        max_drawdown = np.nanmin(equity / np.fmax.accumulate(equity) - 1)
+    cumulative_return = equity[-1] - 1
+
+    active = strat_returns[strat_returns != 0]
+    win_rate = (active > 0).mean() if active.size else None
+    return cumulative_return, max_drawdown, win_rate
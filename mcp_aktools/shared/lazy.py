@@ -0,0 +1,48 @@
+"""Deferred imports for heavy third-party modules."""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    akshare, pandas and numpy together take several seconds to import, so tool
+    modules bind them through this proxy and server start-up only pays for
+    them once a tool actually runs. Attribute writes and deletes (e.g. from
+    ``mock.patch``) are forwarded to the real module.
+    """
+
+    def __init__(self, name: str) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self) -> ModuleType:
+        module = object.__getattribute__(self, "_module")
+        if module is None:
+            # import_module 自带导入锁，并发首次访问也只会真正导入一次
+            module = importlib.import_module(object.__getattribute__(self, "_name"))
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_name")
+        loaded = object.__getattribute__(self, "_module") is not None
+        return f"<LazyModule {name!r} ({'loaded' if loaded else 'not loaded'})>"
+
+
+ak = LazyModule("akshare")
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
@@ -2,32 +2,94 @@
 
 from __future__ import annotations
 
-import pandas as pd
-
+from .lazy import np, pd
 from .schema import INDICATOR_COLUMNS, PRICE_COLUMNS, RATE_COLUMNS, format_error_csv
 
+_INDICATOR_COLUMNS = tuple(INDICATOR_COLUMNS)
+_CSV_SPECIAL = (",", '"', "\n", "\r")
+
+
+def _csv_field(value: str) -> str:
+    if any(ch in value for ch in _CSV_SPECIAL):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _format_column(col: pd.Series, float_format: str) -> list[str] | None:
+    dtype = col.dtype
+    if not isinstance(dtype, np.dtype):
+        return None
+    if dtype.kind == "f":
+        return [float_format % v if v == v else "" for v in col.tolist()]
+    if dtype.kind in "iub":
+        return [str(v) for v in col.tolist()]
+    if dtype.kind == "M":
+        # astype(str) 与 to_csv 使用同一套日期格式推断（纯日期时省略时分秒）
+        texts = col.astype(str).tolist()
+        return [t if t != "NaT" else "" for t in texts]
+    if dtype.kind == "O":
+        out = []
+        for v in col.tolist():
+            if isinstance(v, str):
+                out.append(_csv_field(v))
+            elif v is None or (isinstance(v, float) and v != v) or v is pd.NaT:
+                out.append("")
+            else:
+                # pd.NA、数字、日期等其他对象交给 to_csv 处理，避免与其输出不一致或比较时报错
+                return None
+        return out
+    return None
+
+
+def frame_to_csv(df: pd.DataFrame, float_format: str) -> str:
+    """Serialize a small frame like ``df.to_csv(index=False, float_format=...)``.
+
+    Each row is joined from pre-formatted column lists, which is several times
+    faster than the pandas CSV writer for the few-hundred-row frames the tools
+    return. Frames the fast path cannot render identically fall back to pandas.
+    """
+    columns = [str(col) for col in df.columns]
+    if len(columns) > 1 and all(_csv_field(col) == col for col in columns):
+        formatted = []
+        for _, col in df.items():
+            texts = _format_column(col, float_format)
+            if texts is None:
+                break
+            formatted.append(texts)
+        else:
+            rows = [",".join(columns)]
+            rows.extend(",".join(row) for row in zip(*formatted))
+            return "\n".join(rows)
+    return df.to_csv(index=False, float_format=float_format, lineterminator="\n").strip()
+
 
 def _ensure_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
-    for col in columns:
-        if col not in df.columns:
-            df[col] = None
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        df[missing] = None
     return df
 
 
-def normalize_price_df(
+def normalize_price_frame(
     df: pd.DataFrame | None,
     column_map: dict[str, str],
     source: str,
     currency: str,
     limit: int,
-    float_format: str = "%.2f",
     date_unit: str | None = None,
     indicator_map: dict[str, str] | None = None,
-) -> str:
+    copy: bool = True,
+) -> pd.DataFrame | None:
+    """Normalize a price frame to the canonical schema without serializing it.
+
+    Returns ``None`` when there is no data, so in-process callers can skip the
+    CSV round-trip that ``normalize_price_df`` produces for tool output.
+    """
     if df is None or df.empty:
-        return format_error_csv("empty data", source)
+        return None
 
-    data = df.copy()
+    # 调用方独占的临时 DataFrame 可传 copy=False，直接原地修改以省去一次整表复制
+    data = df.copy() if copy else df
 
     for canonical, original in column_map.items():
         if original in data.columns:
@@ -35,11 +97,15 @@ def normalize_price_df(
 
     date_col = "date"
     if date_col in data.columns:
-        if date_unit:
-            data[date_col] = pd.to_datetime(data[date_col], errors="coerce", unit=date_unit)
-        else:
-            data[date_col] = pd.to_datetime(data[date_col], errors="coerce")
-        data.sort_values(date_col, inplace=True)
+        # 调用方已解析为 datetime64 时跳过重复解析
+        if data[date_col].dtype.kind != "M":
+            if date_unit:
+                data[date_col] = pd.to_datetime(data[date_col], errors="coerce", unit=date_unit)
+            else:
+                data[date_col] = pd.to_datetime(data[date_col], errors="coerce")
+        # 已按日期升序时 O(n) 检查后跳过排序；含 NaT 或乱序时才稳定排序，同日行保持原有先后
+        if not data[date_col].is_monotonic_increasing:
+            data.sort_values(date_col, inplace=True, kind="mergesort")
 
     for numeric_col in ["open", "high", "low", "close", "volume", "amount"]:
         if numeric_col in data.columns:
@@ -49,7 +115,7 @@ def normalize_price_df(
         for canonical, original in indicator_map.items():
             if original in data.columns:
                 data.rename(columns={original: canonical}, inplace=True)
-        for indicator in INDICATOR_COLUMNS:
+        for indicator in _INDICATOR_COLUMNS:
             if indicator in data.columns:
                 data[indicator] = pd.to_numeric(data[indicator], errors="coerce")
 
@@ -57,9 +123,35 @@ def normalize_price_df(
     data["currency"] = currency
     data["source"] = source
 
-    tail = data.tail(limit)
-    columns = PRICE_COLUMNS + [col for col in INDICATOR_COLUMNS if col in tail.columns]
-    return tail.to_csv(columns=columns, index=False, float_format=float_format).strip()
+    present = set(data.columns)
+    columns = PRICE_COLUMNS + [col for col in _INDICATOR_COLUMNS if col in present]
+    return data.tail(limit)[columns]
+
+
+def normalize_price_df(
+    df: pd.DataFrame | None,
+    column_map: dict[str, str],
+    source: str,
+    currency: str,
+    limit: int,
+    float_format: str = "%.2f",
+    date_unit: str | None = None,
+    indicator_map: dict[str, str] | None = None,
+    copy: bool = True,
+) -> str:
+    data = normalize_price_frame(
+        df,
+        column_map,
+        source=source,
+        currency=currency,
+        limit=limit,
+        date_unit=date_unit,
+        indicator_map=indicator_map,
+        copy=copy,
+    )
+    if data is None:
+        return format_error_csv("empty data", source)
+    return frame_to_csv(data, float_format)
 
 
 def normalize_rate_df(
@@ -70,11 +162,12 @@ def normalize_rate_df(
     limit: int,
     float_format: str = "%.4f",
     date_unit: str | None = None,
+    copy: bool = True,
 ) -> str:
     if df is None:
         return format_error_csv("empty data", source)
 
-    data = pd.DataFrame(df)
+    data = df if not copy and isinstance(df, pd.DataFrame) else pd.DataFrame(df)
     if data.empty:
         return format_error_csv("empty data", source)
     for canonical, original in column_map.items():
@@ -95,5 +188,4 @@ def normalize_rate_df(
     data["currency"] = currency
     data["source"] = source
 
-    tail = data.tail(limit)
-    return tail.to_csv(columns=RATE_COLUMNS, index=False, float_format=float_format).strip()
+    return frame_to_csv(data.tail(limit)[RATE_COLUMNS], float_format)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import csv
+from functools import lru_cache
 from io import StringIO
 
 PRICE_COLUMNS = [
@@ -44,8 +45,12 @@ ERROR_COLUMNS = [
 ]
 
 
+@lru_cache(maxsize=256)
 def format_error_csv(error: str, source: str, fallback: str | None = None) -> str:
-    """Return a CSV string with error contract."""
+    """Return a CSV string with error contract.
+
+    Results are memoized: callers pass a handful of fixed messages and sources.
+    """
 
     output = StringIO()
     writer = csv.writer(output)
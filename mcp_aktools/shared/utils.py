@@ -1,16 +1,17 @@
+from __future__ import annotations
+
 import asyncio
 import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
 
-import akshare as ak
-import pandas as pd
-
 from ..cache import CacheKey
 from .constants import PORTFOLIO_FILE
+from .lazy import ak, pd
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +19,40 @@ _LOGGER = logging.getLogger(__name__)
 _executor = ThreadPoolExecutor(max_workers=8)
 
 
+# 同一 key 的并发未命中只让首个调用方请求 akshare，其余调用方等待同一结果
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_inflight_suppressed = 0
+
+
+def _fetch_once(key, cache, fun, args, kwargs, label) -> pd.DataFrame | None:
+    global _inflight_suppressed
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+        else:
+            _inflight_suppressed += 1
+            suppressed = _inflight_suppressed
+    if not leader:
+        _LOGGER.info("Join in-flight %s: %s (%d duplicates suppressed)", label, key, suppressed)
+        return future.result()
+
+    all_df = None
+    try:
+        _LOGGER.info("%s: %s", label, [key, args, kwargs])
+        all_df = fun(*args, **kwargs)
+        cache.set(all_df)
+    except Exception as exc:
+        _LOGGER.exception(str(exc))
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        future.set_result(all_df)
+    return all_df
+
+
 def ak_cache(fun, *args, **kwargs) -> pd.DataFrame | None:
     key = kwargs.pop("key", None)
     if not key:
@@ -27,12 +62,7 @@ def ak_cache(fun, *args, **kwargs) -> pd.DataFrame | None:
     cache = CacheKey.init(key, ttl1, ttl2)
     all_df = cache.get()
     if all_df is None:
-        try:
-            _LOGGER.info("Request akshare: %s", [key, args, kwargs])
-            all_df = fun(*args, **kwargs)
-            cache.set(all_df)
-        except Exception as exc:
-            _LOGGER.exception(str(exc))
+        all_df = _fetch_once(key, cache, fun, args, kwargs, "Request akshare")
     return all_df
 
 
@@ -46,13 +76,10 @@ async def ak_cache_async(fun, *args, **kwargs) -> pd.DataFrame | None:
     cache = CacheKey.init(key, ttl1, ttl2)
     all_df = cache.get()
     if all_df is None:
-        try:
-            _LOGGER.info("Request akshare async: %s", [key, args, kwargs])
-            loop = asyncio.get_event_loop()
-            all_df = await loop.run_in_executor(_executor, partial(fun, *args, **kwargs))
-            cache.set(all_df)
-        except Exception as exc:
-            _LOGGER.exception(str(exc))
+        loop = asyncio.get_running_loop()
+        all_df = await loop.run_in_executor(
+            _executor, partial(_fetch_once, key, cache, fun, args, kwargs, "Request akshare async")
+        )
     return all_df
 
 
@@ -1,12 +1,13 @@
 import asyncio
 from io import StringIO
 
-import pandas as pd
 from fastmcp import Context
 from pydantic import Field
 
 from ..server import mcp
 from ..shared.fields import field_market, field_symbol
+from ..shared.indicators import backtest_metrics, latch_positions
+from ..shared.lazy import np, pd
 from .stocks import market_prices, stock_info, stock_news
 
 
@@ -63,17 +64,12 @@ def draw_ascii_chart(symbol: str = field_symbol, market: str = field_market):
     min_p, max_p = min(prices), max(prices)
     rng = max_p - min_p or 1
     height = 5
-    chart = []
-
-    for h in range(height, -1, -1):
-        row = []
-        threshold = min_p + (h / height) * rng
-        for p in prices:
-            if p >= threshold:
-                row.append("📈" if h == height else "█")
-            else:
-                row.append("  ")
-        chart.append("".join(row))
+
+    # 一次广播比较得到 (行 x 交易日) 的填充矩阵，顶行用 📈 标记
+    thresholds = min_p + (np.arange(height, -1, -1) / height) * rng
+    mask = np.asarray(prices, dtype=np.float64)[None, :] >= thresholds[:, None]
+    fill = np.array(["📈"] + ["█"] * height)[:, None]
+    chart = ["".join(row) for row in np.where(mask, fill, "  ")]
 
     return f"\n{symbol} 最近 20 日走势图:\n" + "\n".join(chart) + f"\n最低: {min_p:.2f}  最高: {max_p:.2f}"
 
@@ -111,92 +107,48 @@ def backtest_strategy(
         long_window = 20
         dfs["ma_short"] = dfs["close"].rolling(short_window).mean()
         dfs["ma_long"] = dfs["close"].rolling(long_window).mean()
-        signal = pd.Series((dfs["ma_short"] > dfs["ma_long"]).astype(int), index=dfs.index)
+        signal = (dfs["ma_short"] > dfs["ma_long"]).astype(int)
         strategy_desc = f"SMA{short_window}/{long_window}"
     elif strategy_key == "RSI":
         if "rsi" not in dfs.columns:
             return "数据缺少 RSI 指标，无法回测"
-        rsi = pd.Series(pd.to_numeric(dfs["rsi"], errors="coerce"), index=dfs.index)
-        positions = []
-        position = 0
-        for value in rsi.to_list():
-            if pd.isna(value):
-                positions.append(position)
-                continue
-            if value < 30:
-                position = 1
-            elif value > 70:
-                position = 0
-            positions.append(position)
-        signal = pd.Series(positions, index=dfs.index)
+        rsi = pd.to_numeric(dfs["rsi"], errors="coerce")
+        signal = latch_positions(rsi < 30, rsi > 70)
         strategy_desc = "RSI(30/70)"
     elif strategy_key == "MACD":
         if "dif" not in dfs.columns or "dea" not in dfs.columns:
             return "数据缺少 MACD 指标，无法回测"
-        dif = pd.Series(pd.to_numeric(dfs["dif"], errors="coerce"), index=dfs.index)
-        dea = pd.Series(pd.to_numeric(dfs["dea"], errors="coerce"), index=dfs.index)
-        signal = pd.Series((dif > dea).astype(int), index=dfs.index)
+        dif = pd.to_numeric(dfs["dif"], errors="coerce")
+        dea = pd.to_numeric(dfs["dea"], errors="coerce")
+        signal = (dif > dea).astype(int)
         strategy_desc = "MACD(DIF/DEA)"
     elif strategy_key == "BOLL":
         if "boll_u" not in dfs.columns or "boll_l" not in dfs.columns:
             return "数据缺少 BOLL 指标，无法回测"
-        boll_u = pd.Series(pd.to_numeric(dfs["boll_u"], errors="coerce"), index=dfs.index)
-        boll_l = pd.Series(pd.to_numeric(dfs["boll_l"], errors="coerce"), index=dfs.index)
-        positions = []
-        position = 0
-        for i, price in enumerate(dfs["close"].to_list()):
-            if pd.isna(boll_u.iloc[i]) or pd.isna(boll_l.iloc[i]):
-                positions.append(position)
-                continue
-            if price <= boll_l.iloc[i]:
-                position = 1
-            elif price >= boll_u.iloc[i]:
-                position = 0
-            positions.append(position)
-        signal = pd.Series(positions, index=dfs.index)
+        boll_u = pd.to_numeric(dfs["boll_u"], errors="coerce")
+        boll_l = pd.to_numeric(dfs["boll_l"], errors="coerce")
+        valid = boll_u.notna() & boll_l.notna()
+        signal = latch_positions(valid & (dfs["close"] <= boll_l), valid & (dfs["close"] >= boll_u))
         strategy_desc = "BOLL(突破下轨买入/上轨卖出)"
     elif strategy_key in ("MA_CROSS", "MACROSS"):
         ma10 = dfs["close"].rolling(10).mean()
         ma30 = dfs["close"].rolling(30).mean()
-        signal = pd.Series((ma10 > ma30).astype(int), index=dfs.index)
+        signal = (ma10 > ma30).astype(int)
         strategy_desc = "MA_CROSS(10/30)"
     elif strategy_key == "KDJ":
         if "kdj_k" not in dfs.columns or "kdj_d" not in dfs.columns:
             return "数据缺少 KDJ 指标，无法回测"
-        kdj_k = pd.Series(pd.to_numeric(dfs["kdj_k"], errors="coerce"), index=dfs.index)
-        kdj_d = pd.Series(pd.to_numeric(dfs["kdj_d"], errors="coerce"), index=dfs.index)
-        positions = []
-        position = 0
-        prev_k, prev_d = None, None
-        for i in range(len(kdj_k)):
-            k_val, d_val = kdj_k.iloc[i], kdj_d.iloc[i]
-            if pd.isna(k_val) or pd.isna(d_val):
-                positions.append(position)
-                prev_k, prev_d = k_val, d_val
-                continue
-            if prev_k is not None and prev_d is not None:
-                if not pd.isna(prev_k) and not pd.isna(prev_d):
-                    if prev_k <= prev_d and k_val > d_val:
-                        position = 1
-                    elif prev_k >= prev_d and k_val < d_val:
-                        position = 0
-            positions.append(position)
-            prev_k, prev_d = k_val, d_val
-        signal = pd.Series(positions, index=dfs.index)
+        kdj_k = pd.to_numeric(dfs["kdj_k"], errors="coerce")
+        kdj_d = pd.to_numeric(dfs["kdj_d"], errors="coerce")
+        prev_k, prev_d = kdj_k.shift(1), kdj_d.shift(1)
+        golden_cross = (prev_k <= prev_d) & (kdj_k > kdj_d)
+        death_cross = (prev_k >= prev_d) & (kdj_k < kdj_d)
+        signal = latch_positions(golden_cross, death_cross)
         strategy_desc = "KDJ(金叉买入/死叉卖出)"
     else:
         return f"不支持的策略类型: {strategy}"
 
-    returns = dfs["close"].pct_change().fillna(0)
-    position = signal.shift(1).fillna(0)
-    strat_returns = returns.mul(position)
-    equity = (1 + strat_returns).cumprod()
-    cumulative_return = equity.iloc[-1] - 1
-    drawdown = equity / equity.cummax() - 1
-    max_drawdown = drawdown.min()
-
-    active = strat_returns[strat_returns != 0]
-    win_rate = (active > 0).mean() if len(active) else None
+    cumulative_return, max_drawdown, win_rate = backtest_metrics(dfs["close"], signal)
 
     start_date = str(dfs["date"].iloc[0]) if "date" in dfs.columns else "-"
     end_date = str(dfs["date"].iloc[-1]) if "date" in dfs.columns else "-"
@@ -1,92 +1,138 @@
+from __future__ import annotations
+
 import asyncio
 import json
 import time
-from io import StringIO
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Lock
 from typing import Any
 
-import pandas as pd
-import requests
+from cachetools import TTLCache, cached
 from fastmcp import Context
 from pydantic import Field
 
 from ..server import mcp
-from ..shared.constants import BINANCE_BASE_URL, OKX_BASE_URL, USER_AGENT
-from ..shared.indicators import add_technical_indicators
-from ..shared.normalize import normalize_price_df
+from ..shared.constants import BINANCE_BASE_URL, OKX_BASE_URL
+from ..shared.http import SESSION
+from ..shared.indicators import add_technical_indicators, backtest_metrics, latch_positions
+from ..shared.lazy import np, pd
+from ..shared.normalize import frame_to_csv, normalize_price_frame
 from ..shared.schema import format_error_csv
 
+# Thread pool for issuing independent exchange requests concurrently
+_executor = ThreadPoolExecutor(max_workers=4)
+
+_EPOCH = datetime(1970, 1, 1)
+
+_CANDLE_NUMERIC_COLUMNS = ["开盘", "最高", "最低", "收盘", "成交量", "成交额"]
+
+
+class _EmptyPayloadError(LookupError):
+    """Raised by the cached fetchers so empty or error payloads are never cached."""
+
 
 def _safe_float(value: Any, default: float = 0.0) -> float:
     """Best-effort numeric parsing for exchange APIs.
 
-    Some OKX endpoints may return empty strings for numeric fields.
+    Some OKX endpoints may return empty strings for numeric fields; both
+    ``None`` and ``""`` already fail the conversion and fall back to ``default``.
     """
 
-    if value in (None, ""):
-        return default
     try:
         return float(value)
     except (TypeError, ValueError):
         return default
 
 
+def _ms_to_datetime(values: pd.Series) -> pd.Series:
+    """Convert OKX millisecond timestamp strings to datetimes.
+
+    OKX sends well-formed integer strings, so they are cast straight to int64;
+    anything unparsable falls back to the coercing path and becomes NaT.
+    """
+
+    try:
+        ms = np.asarray(values, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError):
+        return pd.to_datetime(pd.to_numeric(values, errors="coerce"), errors="coerce", unit="ms")
+    return pd.Series(pd.to_datetime(ms, unit="ms"), index=values.index)
+
+
+def _ms_to_timestamp(ms: int) -> datetime:
+    """Convert a single epoch-millisecond value to a naive UTC datetime.
+
+    Prints the same as ``pd.to_datetime(ms, unit="ms")`` without going through pandas.
+    """
+
+    return _EPOCH + timedelta(milliseconds=ms)
+
+
+def _coerce_ts_and_floats(df: pd.DataFrame, ts_col: str, float_cols: list[str]) -> pd.DataFrame:
+    """Parse an epoch-ms column and coerce value columns to floats in place."""
+
+    df[ts_col] = _ms_to_datetime(df[ts_col])
+    df[float_cols] = df[float_cols].apply(pd.to_numeric, errors="coerce")
+    return df
+
+
 def _safe_int(value: Any, default: int = 0) -> int:
     """Best-effort int parsing for exchange APIs."""
 
-    if value in (None, ""):
-        return default
     try:
         return int(value)
     except (TypeError, ValueError):
         return default
 
 
-@mcp.tool(
-    title="获取加密货币历史价格",
-    description="获取OKX加密货币的历史K线数据，输出标准化行情字段",
-)
-def crypto_prices(
-    symbol: str = Field("BTC-USDT", description="产品ID，格式: BTC-USDT"),
-    period: str = Field(
-        "1H",
-        description="K线时间粒度，仅支持: [1m/3m/5m/15m/30m/1H/2H/4H/6H/12H/1D/2D/3D/1W/1M/3M] 除分钟为小写m外,其余均为大写",
-    ),
-    limit: int = Field(100, description="返回数量(int)，最大300，最小建议30", strict=False),
-):
-    if not period.endswith("m"):
-        period = period.upper()
-    res = requests.get(
+def _okx_candles(inst_id: str, bar: str, limit: int) -> list:
+    """Fetch raw OKX candles."""
+
+    res = SESSION.get(
         f"{OKX_BASE_URL}/api/v5/market/candles",
         params={
-            "instId": symbol,
-            "bar": period,
-            "limit": max(300, limit + 62),
+            "instId": inst_id,
+            "bar": bar,
+            "limit": limit,
         },
         timeout=20,
     )
     data = res.json() or {}
-    dfs = pd.DataFrame(data.get("data", []))
-    currency = symbol.split("-")[-1] if "-" in symbol else "USDT"
-    if dfs.empty:
-        return normalize_price_df(
-            None,
-            {},
-            source="okx",
-            currency=currency,
-            limit=limit,
-        )
-    dfs.columns = ["时间", "开盘", "最高", "最低", "收盘", "成交量", "成交额", "成交额USDT", "K线已完结"]
-    dfs.sort_values("时间", inplace=True)
-    dfs["时间"] = pd.to_numeric(dfs["时间"], errors="coerce")
-    dfs["时间"] = pd.to_datetime(dfs["时间"], errors="coerce", unit="ms")
-    dfs["开盘"] = pd.to_numeric(dfs["开盘"], errors="coerce")
-    dfs["最高"] = pd.to_numeric(dfs["最高"], errors="coerce")
-    dfs["最低"] = pd.to_numeric(dfs["最低"], errors="coerce")
-    dfs["收盘"] = pd.to_numeric(dfs["收盘"], errors="coerce")
-    dfs["成交量"] = pd.to_numeric(dfs["成交量"], errors="coerce")
-    dfs["成交额"] = pd.to_numeric(dfs["成交额"], errors="coerce")
+    return data.get("data", [])
+
+
+@cached(TTLCache(maxsize=128, ttl=30), lock=Lock())
+def _okx_candle_frame(symbol: str, period: str, fetch_limit: int) -> pd.DataFrame:
+    """Build the full normalized candle frame with indicators, cached briefly.
+
+    Sibling tools within the TTL share one request and one indicator pass.
+    The cached frame is shared, so callers must slice a copy before mutating.
+    Raises ``_EmptyPayloadError`` instead of returning an empty result, so a transient
+    empty or error payload is retried on the next call rather than cached.
+    """
+
+    raw = _okx_candles(symbol, period, fetch_limit)
+    if not raw:
+        raise _EmptyPayloadError(symbol)
+    # OKX 每根K线为 [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm]，直接转成 float64 数组建表
+    rows = np.array(raw, dtype=object)
+    try:
+        values = rows[:, 1:7].astype(np.float64)
+    except (TypeError, ValueError):
+        values = pd.DataFrame(rows[:, 1:7]).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    times = _ms_to_datetime(pd.Series(rows[:, 0]))
+    ordered = True
+    if times.is_monotonic_decreasing:
+        # OKX 按时间倒序返回，直接反转即可，省去一次排序
+        values, times = values[::-1], times.iloc[::-1]
+    elif not times.is_monotonic_increasing:
+        ordered = False
+    dfs = pd.DataFrame(values, columns=_CANDLE_NUMERIC_COLUMNS)
+    dfs.insert(0, "时间", times.to_numpy())
+    if not ordered:
+        dfs.sort_values("时间", inplace=True)
     add_technical_indicators(dfs, dfs["收盘"], dfs["最低"], dfs["最高"])
-    return normalize_price_df(
+    frame = normalize_price_frame(
         dfs,
         {
             "date": "时间",
@@ -98,9 +144,8 @@ def crypto_prices(
             "amount": "成交额",
         },
         source="okx",
-        currency=currency,
-        limit=limit,
-        float_format="%.4f",
+        currency=symbol.split("-")[-1] if "-" in symbol else "USDT",
+        limit=len(dfs),
         indicator_map={
             "macd": "MACD",
             "dif": "DIF",
@@ -113,7 +158,71 @@ def crypto_prices(
             "boll_m": "BOLL.M",
             "boll_l": "BOLL.L",
         },
+        copy=False,
     )
+    if frame is None:
+        raise _EmptyPayloadError(symbol)
+    return frame
+
+
+def _crypto_prices_df(symbol: str, period: str, limit: int) -> pd.DataFrame | None:
+    """Fetch OKX candles as a normalized DataFrame with technical indicators.
+
+    In-process callers use this directly instead of re-parsing the CSV output
+    of ``crypto_prices``. Returns ``None`` when OKX returns no candles.
+    """
+
+    if not period.endswith("m"):
+        period = period.upper()
+    try:
+        frame = _okx_candle_frame(symbol, period, max(300, limit + 62))
+    except _EmptyPayloadError:
+        return None
+    return frame.tail(limit).copy()
+
+
+@mcp.tool(
+    title="获取加密货币历史价格",
+    description="获取OKX加密货币的历史K线数据，输出标准化行情字段",
+)
+def crypto_prices(
+    symbol: str = Field("BTC-USDT", description="产品ID，格式: BTC-USDT"),
+    period: str = Field(
+        "1H",
+        description="K线时间粒度，仅支持: [1m/3m/5m/15m/30m/1H/2H/4H/6H/12H/1D/2D/3D/1W/1M/3M] 除分钟为小写m外,其余均为大写",
+    ),
+    limit: int = Field(100, description="返回数量(int)，最大300，最小建议30", strict=False),
+):
+    dfs = _crypto_prices_df(symbol, period, limit)
+    if dfs is None:
+        return format_error_csv("empty data", "okx")
+    return frame_to_csv(dfs, "%.4f")
+
+
+@cached(TTLCache(maxsize=128, ttl=30), lock=Lock())
+def _okx_stat_rows(endpoint: str, ccy: str, period: str, inst_type: str | None = None) -> list:
+    """Fetch raw rows from an OKX rubik stat endpoint, cached briefly.
+
+    Raises ``_EmptyPayloadError`` when OKX returns no rows, so it is not cached.
+    """
+
+    params = {"ccy": ccy, "period": period}
+    if inst_type is not None:
+        params["instType"] = inst_type
+    res = SESSION.get(f"{OKX_BASE_URL}/api/v5/rubik/stat/{endpoint}", params=params, timeout=20)
+    rows = (res.json() or {}).get("data")
+    if not rows:
+        raise _EmptyPayloadError(endpoint)
+    return rows
+
+
+def _stat_frame(task: Future) -> pd.DataFrame:
+    """Resolve a submitted ``_okx_stat_rows`` call, treating an empty payload as an empty frame."""
+
+    try:
+        return pd.DataFrame(task.result())
+    except _EmptyPayloadError:
+        return pd.DataFrame()
 
 
 @mcp.tool(
@@ -125,50 +234,31 @@ def crypto_sentiment_metrics(
     period: str = Field("1h", description="时间粒度，仅支持: [5m/1H/1D] 注意大小写，仅分钟为小写m"),
     inst_type: str = Field("SPOT", description="产品类型 SPOT:现货 CONTRACTS:衍生品"),
 ):
-    loan_res = requests.get(
-        f"{OKX_BASE_URL}/api/v5/rubik/stat/margin/loan-ratio",
-        params={
-            "ccy": symbol,
-            "period": period,
-        },
-        timeout=20,
-    )
-    taker_res = requests.get(
-        f"{OKX_BASE_URL}/api/v5/rubik/stat/taker-volume",
-        params={
-            "ccy": symbol,
-            "period": period,
-            "instType": inst_type,
-        },
-        timeout=20,
-    )
-    loan_data = pd.DataFrame((loan_res.json() or {}).get("data", []))
-    taker_data = pd.DataFrame((taker_res.json() or {}).get("data", []))
+    # 两个接口互不依赖，并行请求以节省一次往返时间
+    loan_task = _executor.submit(_okx_stat_rows, "margin/loan-ratio", symbol, period)
+    taker_task = _executor.submit(_okx_stat_rows, "taker-volume", symbol, period, inst_type)
+    loan_data = _stat_frame(loan_task)
+    taker_data = _stat_frame(taker_task)
     if loan_data.empty and taker_data.empty:
         return format_error_csv("empty data", "okx", fallback=symbol)
 
     if not loan_data.empty:
         loan_data.columns = ["时间", "多空比"]
-        loan_data["时间"] = pd.to_numeric(loan_data["时间"], errors="coerce")
-        loan_data["时间"] = pd.to_datetime(loan_data["时间"], errors="coerce", unit="ms")
-        loan_data["多空比"] = pd.to_numeric(loan_data["多空比"], errors="coerce")
+        _coerce_ts_and_floats(loan_data, "时间", ["多空比"])
 
     if not taker_data.empty:
         taker_data.columns = ["时间", "卖出量", "买入量"]
-        taker_data["时间"] = pd.to_numeric(taker_data["时间"], errors="coerce")
-        taker_data["时间"] = pd.to_datetime(taker_data["时间"], errors="coerce", unit="ms")
-        taker_data["卖出量"] = pd.to_numeric(taker_data["卖出量"], errors="coerce")
-        taker_data["买入量"] = pd.to_numeric(taker_data["买入量"], errors="coerce")
+        _coerce_ts_and_floats(taker_data, "时间", ["卖出量", "买入量"])
 
     if loan_data.empty:
-        merged = taker_data
+        merged = taker_data.sort_values("时间")
     elif taker_data.empty:
-        merged = loan_data
+        merged = loan_data.sort_values("时间")
     else:
-        merged = pd.merge(loan_data, taker_data, on="时间", how="outer")
+        # merge_ordered 按时间有序合并，结果已排序，无需再单独排序一次
+        merged = pd.merge_ordered(loan_data, taker_data, on="时间", how="outer")
 
-    merged.sort_values("时间", inplace=True)
-    return merged.to_csv(index=False, float_format="%.2f").strip()
+    return frame_to_csv(merged, "%.2f")
 
 
 @mcp.tool(
@@ -178,7 +268,7 @@ def crypto_sentiment_metrics(
 def binance_ai_report(
     symbol: str = Field("BTC", description="加密货币币种，格式: BTC 或 ETH"),
 ):
-    res = requests.post(
+    res = SESSION.post(
         f"{BINANCE_BASE_URL}/bapi/bigdata/v3/friendly/bigdata/search/ai-report/report",
         json={
             "lang": "zh-CN",
@@ -189,7 +279,6 @@ def binance_ai_report(
             "translateToken": None,
         },
         headers={
-            "User-Agent": USER_AGENT,
             "Referer": f"https://www.binance.com/zh-CN/trade/{symbol}_USDT?type=spot",
             "lang": "zh-CN",
         },
@@ -199,7 +288,8 @@ def binance_ai_report(
         resp = res.json() or {}
     except Exception:
         try:
-            resp = json.loads(res.text.strip()) or {}
+            # 直接解析原始字节，json 会自行识别 UTF 编码/BOM，避免 res.text 的字符集探测
+            resp = json.loads(res.content.strip()) or {}
         except Exception:
             return res.text
     data = resp.get("data") or {}
@@ -210,8 +300,7 @@ def binance_ai_report(
     for module in modules:
         if tit := module.get("overview"):
             txts.append(tit)
-        for point in module.get("points", []):
-            txts.append(point.get("content", ""))
+        txts.extend([point.get("content", "") for point in module.get("points", [])])
     return "\n".join(txts)
 
 
@@ -231,7 +320,7 @@ async def crypto_composite_diagnostic(
     if ctx:
         await ctx.report_progress(20, 100, "并行获取数据...")
 
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     price_task = loop.run_in_executor(None, crypto_prices.fn, inst_id, "4H", 10)
     sentiment_task = loop.run_in_executor(None, crypto_sentiment_metrics.fn, symbol, "1H", "SPOT")
     ai_task = loop.run_in_executor(None, binance_ai_report.fn, symbol)
@@ -258,41 +347,22 @@ def draw_crypto_chart(
     bar: str = Field("1D", description="K线周期: 1H/4H/1D"),
 ):
     inst_id = f"{symbol}-USDT"
-    data = crypto_prices.fn(symbol=inst_id, period=bar, limit=20)
-    if not isinstance(data, str) or not data:
-        return "数据不足，无法绘图"
-
-    try:
-        dfs = pd.read_csv(StringIO(data))
-    except Exception:
-        return "数据不足，无法绘图"
-
-    if dfs.empty or "close" not in dfs.columns:
+    dfs = _crypto_prices_df(inst_id, bar, 20)
+    if dfs is None or dfs.empty or "close" not in dfs.columns:
         return "数据不足，无法绘图"
 
-    prices = []
-    for value in dfs["close"].to_list():
-        if pd.isna(value):
-            continue
-        try:
-            prices.append(float(value))
-        except (TypeError, ValueError):
-            continue
-
+    prices = pd.to_numeric(dfs["close"], errors="coerce").dropna().to_numpy(dtype=np.float64)
     if len(prices) < 3:
         return "数据不足，无法绘图"
 
-    min_p, max_p = min(prices), max(prices)
+    min_p, max_p = float(prices.min()), float(prices.max())
     rng = max_p - min_p or 1
     height = 5
-    chart = []
 
-    for h in range(height, -1, -1):
-        row = []
-        threshold = min_p + (h / height) * rng
-        for p in prices:
-            row.append("█" if p >= threshold else " ")
-        chart.append("".join(row))
+    # 一次广播比较得到 (行 x K线) 的填充矩阵，逐行拼接成字符
+    thresholds = min_p + (np.arange(height, -1, -1) / height) * rng
+    mask = prices[None, :] >= thresholds[:, None]
+    chart = ["".join(row) for row in np.where(mask, "█", " ")]
 
     return (
         f"\n{symbol} 最近 {len(prices)} 根 {bar} K线走势:\n"
@@ -311,20 +381,12 @@ def backtest_crypto_strategy(
     bar: str = Field("4H", description="K线周期: 1H/4H/1D"),
     limit: int = Field(200, description="回测K线数量", strict=False),
 ):
-    from io import StringIO
-
     inst_id = f"{symbol}-USDT"
-    data = crypto_prices.fn(symbol=inst_id, period=bar, limit=limit)
-
-    if not isinstance(data, str) or not data:
+    dfs = _crypto_prices_df(inst_id, bar, limit)
+    if dfs is None:
         return f"未找到可回测数据: {symbol}"
 
-    try:
-        dfs = pd.read_csv(StringIO(data))
-    except Exception:
-        return "价格数据解析失败"
-
-    if dfs is None or dfs.empty or "close" not in dfs.columns:
+    if dfs.empty or "close" not in dfs.columns:
         return "数据不足，无法回测"
 
     close = pd.to_numeric(dfs["close"], errors="coerce")
@@ -337,48 +399,29 @@ def backtest_crypto_strategy(
         short_window, long_window = 5, 20
         dfs["ma_short"] = dfs["close"].rolling(short_window).mean()
         dfs["ma_long"] = dfs["close"].rolling(long_window).mean()
-        signal = pd.Series((dfs["ma_short"] > dfs["ma_long"]).astype(int), index=dfs.index)
+        signal = (dfs["ma_short"] > dfs["ma_long"]).astype(int)
         strategy_desc = f"SMA{short_window}/{long_window}"
     elif strategy_key == "RSI":
         if "rsi" not in dfs.columns:
             return "数据缺少 RSI 指标，无法回测"
-        rsi = pd.Series(pd.to_numeric(dfs["rsi"], errors="coerce"), index=dfs.index)
-        positions = []
-        position = 0
-        for value in rsi.to_list():
-            if pd.isna(value):
-                positions.append(position)
-                continue
-            if value < 30:
-                position = 1
-            elif value > 70:
-                position = 0
-            positions.append(position)
-        signal = pd.Series(positions, index=dfs.index)
+        rsi = pd.to_numeric(dfs["rsi"], errors="coerce")
+        signal = latch_positions(rsi < 30, rsi > 70)
         strategy_desc = "RSI(30/70)"
     elif strategy_key == "MACD":
         if "dif" not in dfs.columns or "dea" not in dfs.columns:
             return "数据缺少 MACD 指标，无法回测"
-        dif = pd.Series(pd.to_numeric(dfs["dif"], errors="coerce"), index=dfs.index)
-        dea = pd.Series(pd.to_numeric(dfs["dea"], errors="coerce"), index=dfs.index)
-        signal = pd.Series((dif > dea).astype(int), index=dfs.index)
+        dif = pd.to_numeric(dfs["dif"], errors="coerce")
+        dea = pd.to_numeric(dfs["dea"], errors="coerce")
+        signal = (dif > dea).astype(int)
         strategy_desc = "MACD(DIF/DEA)"
     else:
         return f"不支持的策略类型: {strategy}"
 
-    returns = dfs["close"].pct_change().fillna(0)
-    position = signal.shift(1).fillna(0)
-    strat_returns = returns.mul(position)
-    equity = (1 + strat_returns).cumprod()
-    cumulative_return = equity.iloc[-1] - 1
-    drawdown = equity / equity.cummax() - 1
-    max_drawdown = drawdown.min()
+    # 在连续的 float64 数组上计算收益、净值与回撤，持仓整体后移一根K线（次根生效）
+    cumulative_return, max_drawdown, win_rate = backtest_metrics(dfs["close"], signal)
 
-    active = strat_returns[strat_returns != 0]
-    win_rate = (active > 0).mean() if len(active) > 0 else None
-
-    start_time = str(dfs["时间"].iloc[0]) if "时间" in dfs.columns else "-"
-    end_time = str(dfs["时间"].iloc[-1]) if "时间" in dfs.columns else "-"
+    start_time = str(dfs["date"].iloc[0]) if "date" in dfs.columns else "-"
+    end_time = str(dfs["date"].iloc[-1]) if "date" in dfs.columns else "-"
     win_text = f"{win_rate:.2%}" if win_rate is not None else "N/A"
 
     return (
@@ -392,6 +435,29 @@ def backtest_crypto_strategy(
     )
 
 
+@cached(TTLCache(maxsize=64, ttl=30), lock=Lock())
+def _okx_funding_rate(inst_id: str) -> tuple[float, float, int]:
+    """Fetch and unpack the OKX funding rate as (rate, next_rate, funding_ms).
+
+    Raises ``_EmptyPayloadError`` when OKX returns no items, so it is not cached.
+    """
+
+    res = SESSION.get(
+        f"{OKX_BASE_URL}/api/v5/public/funding-rate",
+        params={"instId": inst_id},
+        timeout=20,
+    )
+    items = (res.json() or {}).get("data") or []
+    if not items:
+        raise _EmptyPayloadError(inst_id)
+    item = items[0]
+    return (
+        _safe_float(item.get("fundingRate")),
+        _safe_float(item.get("nextFundingRate")),
+        _safe_int(item.get("fundingTime")),
+    )
+
+
 @mcp.tool(
     title="获取资金费率",
     description="获取OKX永续合约的资金费率，正费率表示多头付费给空头，负费率反之",
@@ -399,22 +465,14 @@ def backtest_crypto_strategy(
 def okx_funding_rate(
     symbol: str = Field("BTC", description="币种，格式: BTC 或 ETH"),
 ):
-    inst_id = f"{symbol}-USDT-SWAP"
-    res = requests.get(
-        f"{OKX_BASE_URL}/api/v5/public/funding-rate",
-        params={"instId": inst_id},
-        timeout=20,
-    )
-    data = res.json() or {}
-    items = data.get("data", [])
-    if not items:
+    try:
+        rate, next_rate, funding_ts = _okx_funding_rate(f"{symbol}-USDT-SWAP")
+    except _EmptyPayloadError:
         return f"未找到 {symbol} 的资金费率数据"
 
-    item = items[0]
-    current_rate = _safe_float(item.get("fundingRate")) * 100
-    next_rate = _safe_float(item.get("nextFundingRate")) * 100
-    funding_ts = _safe_int(item.get("fundingTime"))
-    funding_time = pd.to_datetime(funding_ts, unit="ms") if funding_ts else "N/A"
+    current_rate = rate * 100
+    next_rate = next_rate * 100
+    funding_time = _ms_to_timestamp(funding_ts) if funding_ts else "N/A"
 
     sentiment = "多头拥挤" if current_rate > 0.05 else "空头占优" if current_rate < -0.05 else "中性"
 
@@ -427,6 +485,25 @@ def okx_funding_rate(
     )
 
 
+@cached(TTLCache(maxsize=64, ttl=30), lock=Lock())
+def _okx_open_interest(inst_id: str) -> tuple[float, float, int]:
+    """Fetch and unpack OKX open interest as (oi, oi_ccy, ts_ms).
+
+    Raises ``_EmptyPayloadError`` when OKX returns no items, so it is not cached.
+    """
+
+    res = SESSION.get(
+        f"{OKX_BASE_URL}/api/v5/public/open-interest",
+        params={"instId": inst_id},
+        timeout=20,
+    )
+    items = (res.json() or {}).get("data") or []
+    if not items:
+        raise _EmptyPayloadError(inst_id)
+    item = items[0]
+    return float(item.get("oi", 0)), float(item.get("oiCcy", 0)), int(item.get("ts", 0))
+
+
 @mcp.tool(
     title="获取合约持仓量",
     description="获取OKX永续合约的持仓量数据，用于判断市场资金流向",
@@ -434,38 +511,38 @@ def okx_funding_rate(
 def okx_open_interest(
     symbol: str = Field("BTC", description="币种，格式: BTC 或 ETH"),
 ):
-    inst_id = f"{symbol}-USDT-SWAP"
-    res = requests.get(
-        f"{OKX_BASE_URL}/api/v5/public/open-interest",
-        params={"instId": inst_id},
-        timeout=20,
-    )
-    data = res.json() or {}
-    items = data.get("data", [])
-    if not items:
+    try:
+        oi, oi_ccy, ts_ms = _okx_open_interest(f"{symbol}-USDT-SWAP")
+    except _EmptyPayloadError:
         return f"未找到 {symbol} 的持仓量数据"
 
-    item = items[0]
-    oi = float(item.get("oi", 0))
-    oi_ccy = float(item.get("oiCcy", 0))
-    ts = pd.to_datetime(int(item.get("ts", 0)), unit="ms")
+    ts = _ms_to_timestamp(ts_ms)
 
     return f"--- {symbol} 合约持仓量 ---\n持仓量(张): {oi:,.0f}\n持仓量(币): {oi_ccy:,.2f} {symbol}\n更新时间: {ts}"
 
 
-@mcp.tool(
-    title="获取恐惧贪婪指数",
-    description="获取加密货币市场恐惧贪婪指数(0-100)，0为极度恐惧，100为极度贪婪",
-)
-def fear_greed_index():
-    res = requests.get(
+# 恐惧贪婪指数按日更新，缓存一小时即可；空结果抛出异常，不会被缓存
+@cached(TTLCache(maxsize=1, ttl=3600), lock=Lock())
+def _fear_greed_items() -> list:
+    res = SESSION.get(
         "https://api.alternative.me/fng/",
         params={"limit": 7},
         timeout=20,
     )
-    data = res.json() or {}
-    items = data.get("data", [])
+    items = (res.json() or {}).get("data")
     if not items:
+        raise _EmptyPayloadError("fng")
+    return items
+
+
+@mcp.tool(
+    title="获取恐惧贪婪指数",
+    description="获取加密货币市场恐惧贪婪指数(0-100)，0为极度恐惧，100为极度贪婪",
+)
+def fear_greed_index():
+    try:
+        items = _fear_greed_items()
+    except _EmptyPayloadError:
         return "未能获取恐惧贪婪指数"
 
     current = items[0]
@@ -1,10 +1,9 @@
 """外汇数据工具模块"""
 
-import akshare as ak
-import pandas as pd
 from pydantic import Field
 
 from mcp_aktools.server import mcp
+from mcp_aktools.shared.lazy import ak, pd
 from mcp_aktools.shared.normalize import normalize_rate_df
 from mcp_aktools.shared.utils import ak_cache
 
@@ -32,21 +31,22 @@ def fx_rates(
     ),
 ):
     """获取实时外汇汇率"""
+    sym_u = symbol.upper() if symbol else ""
     raw = ak_cache(ak.fx_spot_quote, ttl=300)
     if not isinstance(raw, pd.DataFrame):
-        return normalize_rate_df(None, {}, source="akshare", currency=symbol.upper(), limit=1)
-    df = raw.copy()
+        return normalize_rate_df(None, {}, source="akshare", currency=sym_u, limit=1)
 
-    data = df.copy()
-    if symbol and symbol.upper() in FX_PAIRS:
-        pair_name = FX_PAIRS[symbol.upper()]
+    # 缓存中的原表只读，筛选后只复制选中的行
+    data = raw
+    pair_name = FX_PAIRS.get(sym_u)
+    if pair_name:
         if "货币对" in data.columns:
-            mask = data["货币对"].str.contains(symbol, case=False, na=False)
+            mask = data["货币对"].str.contains(symbol, case=False, regex=False, na=False)
             data = data.loc[mask]
             if isinstance(data, pd.Series):
                 data = data.to_frame().T
         elif "名称" in data.columns:
-            mask = data["名称"].str.contains(pair_name, case=False, na=False)
+            mask = data["名称"].str.contains(pair_name, case=False, regex=False, na=False)
             data = data.loc[mask]
             if isinstance(data, pd.Series):
                 data = data.to_frame().T
@@ -58,7 +58,7 @@ def fx_rates(
             break
 
     if rate_column is None:
-        return normalize_rate_df(None, {}, source="akshare", currency=symbol.upper(), limit=1)
+        return normalize_rate_df(None, {}, source="akshare", currency=sym_u, limit=1)
 
     data = data.copy()
     data["rate"] = data[rate_column]
@@ -71,9 +71,10 @@ def fx_rates(
         data,
         {"date": "date", "rate": "rate"},
         source="akshare",
-        currency=symbol.upper() if symbol else "FX",
+        currency=sym_u or "FX",
         limit=len(data),
         float_format="%.4f",
+        copy=False,
     )
 
 
@@ -93,9 +94,9 @@ def fx_history(
     raw = ak_cache(ak.fx_pair_quote, symbol=symbol.upper())
     if not isinstance(raw, pd.DataFrame):
         return normalize_rate_df(None, {}, source="akshare", currency=symbol.upper(), limit=limit)
-    df = raw.copy()
 
-    df = df.tail(limit).copy()
+    # 只复制需要的末尾几行，缓存中的原表保持不变
+    df = raw.tail(limit).copy()
     date_col = "日期" if "日期" in df.columns else "时间" if "时间" in df.columns else None
     rate_col = None
     for candidate in ["收盘价", "最新价", "收盘"]:
@@ -105,7 +106,6 @@ def fx_history(
     if date_col is None or rate_col is None:
         return normalize_rate_df(None, {}, source="akshare", currency=symbol.upper(), limit=limit)
 
-    df = df.copy()
     df["rate"] = df[rate_col]
 
     return normalize_rate_df(
@@ -115,4 +115,5 @@ def fx_history(
         currency=symbol.upper(),
         limit=limit,
         float_format="%.4f",
+        copy=False,
     )
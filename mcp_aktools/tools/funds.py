@@ -1,10 +1,10 @@
 """基金数据工具模块"""
 
-import akshare as ak
-import pandas as pd
 from pydantic import Field
 
 from mcp_aktools.server import mcp
+from mcp_aktools.shared.lazy import ak, pd
+from mcp_aktools.shared.normalize import frame_to_csv
 from mcp_aktools.shared.schema import format_error_csv
 from mcp_aktools.shared.utils import ak_cache
 
@@ -44,7 +44,7 @@ def fund_nav(
     if "净值日期" in df.columns:
         df["净值日期"] = pd.to_datetime(df["净值日期"], errors="coerce")
 
-    return df.to_csv(index=False, float_format="%.4f")
+    return frame_to_csv(df, "%.4f")
 
 
 @mcp.tool(
@@ -59,7 +59,7 @@ def fund_holdings(
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=code)
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -78,6 +78,6 @@ def fund_ranking(
         return format_error_csv("empty data", "akshare", fallback=type)
 
     # 限制返回数量，避免数据过大
-    df = df.head(100).copy()
+    df = df.head(100)
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
@@ -1,11 +1,10 @@
 """期货数据工具模块"""
 
-import akshare as ak
-import pandas as pd
 from pydantic import Field
 
 from mcp_aktools.server import mcp
-from mcp_aktools.shared.normalize import normalize_price_df
+from mcp_aktools.shared.lazy import ak, pd
+from mcp_aktools.shared.normalize import frame_to_csv, normalize_price_df
 from mcp_aktools.shared.schema import format_error_csv
 from mcp_aktools.shared.utils import ak_cache
 
@@ -88,6 +87,7 @@ def futures_prices(
         currency="CNY",
         limit=limit,
         float_format="%.2f",
+        copy=False,
     )
 
 
@@ -117,7 +117,7 @@ def futures_inventory(
         df["日期"] = pd.to_datetime(df["时间"], errors="coerce")
         df = df.drop(columns=["时间"])
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -146,7 +146,7 @@ def futures_basis(
         df["日期"] = pd.to_datetime(df["时间"], errors="coerce")
         df = df.drop(columns=["时间"])
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -168,4 +168,4 @@ def futures_positions(
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=symbol)
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
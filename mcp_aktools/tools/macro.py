@@ -1,9 +1,9 @@
 """宏观经济数据工具模块"""
 
-import akshare as ak
 from pydantic import Field
 
 from mcp_aktools.server import mcp
+from mcp_aktools.shared.lazy import ak
 from mcp_aktools.shared.utils import ak_cache
 
 
@@ -19,7 +19,7 @@ def macro_gdp(
     if df is None or df.empty:
         return ""
 
-    df = df.tail(limit).copy()
+    df = df.tail(limit)
 
     return df.to_csv(index=False, float_format="%.2f")
 
@@ -36,7 +36,7 @@ def macro_cpi(
     if df is None or df.empty:
         return ""
 
-    df = df.tail(limit).copy()
+    df = df.tail(limit)
 
     return df.to_csv(index=False, float_format="%.2f")
 
@@ -53,7 +53,7 @@ def macro_pmi(
     if df is None or df.empty:
         return ""
 
-    df = df.tail(limit).copy()
+    df = df.tail(limit)
 
     return df.to_csv(index=False, float_format="%.2f")
 
@@ -70,7 +70,7 @@ def macro_interest_rate(
     if df is None or df.empty:
         return ""
 
-    df = df.tail(limit).copy()
+    df = df.tail(limit)
 
     return df.to_csv(index=False, float_format="%.2f")
 
@@ -87,6 +87,6 @@ def macro_money_supply(
     if df is None or df.empty:
         return ""
 
-    df = df.tail(limit).copy()
+    df = df.tail(limit)
 
     return df.to_csv(index=False, float_format="%.2f")
@@ -1,13 +1,11 @@
 import os
 from datetime import datetime, timedelta
 
-import akshare as ak
-import pandas as pd
-import requests
 from pydantic import Field
 
 from ..server import mcp
-from ..shared.constants import USER_AGENT
+from ..shared.http import SESSION
+from ..shared.lazy import ak, pd
 from ..shared.utils import ak_cache, recent_trade_date
 
 
@@ -205,11 +203,10 @@ def newsnow_news(channels=None):
         channels = channels.split(",")
     all_news = []
     try:
-        res = requests.post(
+        res = SESSION.post(
             f"{base}/api/s/entire",
             json={"sources": channels},
             headers={
-                "User-Agent": USER_AGENT,
                 "Referer": base,
             },
             timeout=60,
@@ -1,11 +1,11 @@
 from datetime import datetime
 from io import StringIO
 
-import pandas as pd
 from pydantic import Field
 
 from ..server import mcp
 from ..shared.fields import field_market
+from ..shared.lazy import pd
 from ..shared.utils import load_portfolio, save_portfolio
 from .stocks import market_prices
 
@@ -1,13 +1,18 @@
 """贵金属数据工具模块"""
 
-import akshare as ak
-import pandas as pd
+import asyncio
+from collections.abc import Callable
+from contextlib import suppress
+from functools import lru_cache, partial
+from typing import Any, NamedTuple
+
 from fastmcp import Context
 from pydantic import Field
 
 from mcp_aktools.server import mcp
 from mcp_aktools.shared.indicators import add_technical_indicators
-from mcp_aktools.shared.normalize import normalize_price_df
+from mcp_aktools.shared.lazy import ak, pd
+from mcp_aktools.shared.normalize import frame_to_csv, normalize_price_df
 from mcp_aktools.shared.schema import format_error_csv
 from mcp_aktools.shared.utils import ak_cache
 
@@ -20,6 +25,52 @@ SGE_SYMBOLS = {
     "Ag(T+D)": "白银T+D",
 }
 
+# 上海金交所现货行情中文列名 -> 标准英文列名
+CN2EN = {
+    "日期": "date",
+    "开盘价": "open",
+    "最高价": "high",
+    "最低价": "low",
+    "收盘价": "close",
+    "成交量": "volume",
+}
+
+# 技术指标列 -> 输出列名，模块级常量避免每次调用重建
+SPOT_INDICATOR_MAP = {
+    "macd": "MACD",
+    "dif": "DIF",
+    "dea": "DEA",
+    "kdj_k": "KDJ.K",
+    "kdj_d": "KDJ.D",
+    "kdj_j": "KDJ.J",
+    "rsi": "RSI",
+    "boll_u": "BOLL.U",
+    "boll_m": "BOLL.M",
+    "boll_l": "BOLL.L",
+}
+
+
+class Metal(NamedTuple):
+    """One supported metal: its quote symbols and the akshare endpoints behind it."""
+
+    sge: str
+    intl: str
+    name_cn: str
+    etf_fn: Callable[[], Any]
+    benchmark_fn: Callable[[], Any]
+
+
+@lru_cache(maxsize=1)
+def _metals() -> dict[str, Metal]:
+    # 首次调用时才构建，访问 ak.* 不会在导入模块时加载 akshare。
+    # 表中保存的是首次调用时取到的 ak.* 函数本身：之后再 patch ak.macro_cons_* 或
+    # ak.spot_*_benchmark_sge 不会生效，需先调用 _metals.cache_clear()
+    return {
+        "gold": Metal("Au99.99", "XAU", "黄金", ak.macro_cons_gold, ak.spot_golden_benchmark_sge),
+        "silver": Metal("Ag99.99", "XAG", "白银", ak.macro_cons_silver, ak.spot_silver_benchmark_sge),
+    }
+
+
 # 国际品种映射
 INTL_SYMBOLS = {
     "XAU": "伦敦金",
@@ -39,6 +90,7 @@ def pm_spot_prices(
         description="品种代码，支持: Au99.99(黄金9999), Au99.95(黄金9995), Au(T+D)(黄金T+D), Ag99.99(白银9999), Ag(T+D)(白银T+D)",
     ),
     limit: int = Field(30, description="返回数量(int)，建议30-252", strict=False),
+    with_indicators: bool = Field(True, description="是否计算 MACD/KDJ/RSI/BOLL 技术指标"),
 ):
     """获取上海金交所现货历史价格"""
     df = ak_cache(ak.spot_hist_sge, symbol=symbol)
@@ -51,56 +103,38 @@ def pm_spot_prices(
             limit=limit,
         )
 
-    df = df.tail(limit + 62)
-
-    uses_chinese_cols = "日期" in df.columns
-    date_col = "日期" if uses_chinese_cols else "date"
-    open_col = "开盘价" if uses_chinese_cols else "open"
-    high_col = "最高价" if uses_chinese_cols else "high"
-    low_col = "最低价" if uses_chinese_cols else "low"
-    close_col = "收盘价" if uses_chinese_cols else "close"
-    volume_col = "成交量" if uses_chinese_cols else "volume"
-
-    df.sort_values(date_col, inplace=True)
-    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-    df[open_col] = pd.to_numeric(df[open_col], errors="coerce")
-    df[high_col] = pd.to_numeric(df[high_col], errors="coerce")
-    df[low_col] = pd.to_numeric(df[low_col], errors="coerce")
-    df[close_col] = pd.to_numeric(df[close_col], errors="coerce")
-    if volume_col in df.columns:
-        df[volume_col] = pd.to_numeric(df[volume_col], errors="coerce")
-
-    add_technical_indicators(df, df[close_col], df[low_col], df[high_col])
-
-    column_map: dict[str, str] = {
-        "date": date_col,
-        "open": open_col,
-        "high": high_col,
-        "low": low_col,
-        "close": close_col,
-    }
-    if volume_col in df.columns:
-        column_map["volume"] = volume_col
+    # 复制所需的末尾部分（含指标预热），后续原地修改不会波及缓存中的原表
+    df = df.tail(limit + 62 if with_indicators else limit).copy()
+
+    # 旧版 akshare 返回中文列名，统一成英文后按固定列名处理
+    df.rename(columns=CN2EN, inplace=True)
+
+    # akshare 返回 datetime.date 对象或 ISO 字符串，由 pandas 推断；已是 datetime64 时跳过
+    if df["date"].dtype.kind != "M":
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    # 数据通常已按日期升序，O(n) 检查后跳过排序；含 NaT 或乱序时才在 datetime64 上稳定排序
+    if not df["date"].is_monotonic_increasing:
+        df.sort_values("date", inplace=True, kind="mergesort")
+    numeric_cols = ["open", "high", "low", "close"]
+    if "volume" in df.columns:
+        numeric_cols.append("volume")
+    # 已是数值类型的列无需再转换，其余列一次性批量转换
+    pending = [col for col in numeric_cols if df[col].dtype.kind not in "iuf"]
+    if pending:
+        df[pending] = df[pending].apply(pd.to_numeric, errors="coerce")
+
+    if with_indicators:
+        add_technical_indicators(df, df["close"], df["low"], df["high"])
 
     return normalize_price_df(
         df,
-        column_map,
+        {},
         source="akshare",
         currency="CNY",
         limit=limit,
         float_format="%.2f",
-        indicator_map={
-            "macd": "MACD",
-            "dif": "DIF",
-            "dea": "DEA",
-            "kdj_k": "KDJ.K",
-            "kdj_d": "KDJ.D",
-            "kdj_j": "KDJ.J",
-            "rsi": "RSI",
-            "boll_u": "BOLL.U",
-            "boll_m": "BOLL.M",
-            "boll_l": "BOLL.L",
-        },
+        indicator_map=SPOT_INDICATOR_MAP if with_indicators else None,
+        copy=False,
     )
 
 
@@ -116,7 +150,7 @@ def pm_international_prices(
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=symbol)
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -128,18 +162,16 @@ def pm_etf_holdings(
     limit: int = Field(30, description="返回数量(int)，建议30-90", strict=False),
 ):
     """获取贵金属ETF持仓变化"""
-    if metal.lower() == "gold":
-        df = ak_cache(ak.macro_cons_gold)
-    elif metal.lower() == "silver":
-        df = ak_cache(ak.macro_cons_silver)
-    else:
+    info = _metals().get(metal.lower())
+    if info is None:
         return "不支持的金属类型，仅支持: gold, silver"
+    df = ak_cache(info.etf_fn)
 
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=metal)
 
     df = df.tail(limit)
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -156,7 +188,7 @@ def pm_comex_inventory(
         return format_error_csv("empty data", "akshare", fallback=metal)
 
     df = df.tail(limit)
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -171,7 +203,7 @@ def pm_basis(
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=metal)
 
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -183,18 +215,16 @@ def pm_benchmark_price(
     limit: int = Field(30, description="返回数量(int)，建议30-90", strict=False),
 ):
     """获取上海金银基准价"""
-    if metal.lower() == "gold":
-        df = ak_cache(ak.spot_golden_benchmark_sge)
-    elif metal.lower() == "silver":
-        df = ak_cache(ak.spot_silver_benchmark_sge)
-    else:
+    info = _metals().get(metal.lower())
+    if info is None:
         return "不支持的金属类型，仅支持: gold, silver"
+    df = ak_cache(info.benchmark_fn)
 
     if df is None or df.empty:
         return format_error_csv("empty data", "akshare", fallback=metal)
 
     df = df.tail(limit)
-    return df.to_csv(index=False, float_format="%.2f")
+    return frame_to_csv(df, "%.2f")
 
 
 @mcp.tool(
@@ -210,40 +240,38 @@ async def pm_composite_diagnostic(
         await ctx.report_progress(0, 100, "开始贵金属综合诊断...")
 
     # 确定品种代码
-    if metal.lower() == "gold":
-        sge_symbol = "Au99.99"
-        intl_symbol = "XAU"
-        metal_cn = "黄金"
-    elif metal.lower() == "silver":
-        sge_symbol = "Ag99.99"
-        intl_symbol = "XAG"
-        metal_cn = "白银"
-    else:
+    info = _metals().get(metal.lower())
+    if info is None:
         return "不支持的金属类型，仅支持: gold, silver"
+    sge_symbol, intl_symbol, metal_cn = info.sge, info.intl, info.name_cn
 
     if ctx:
-        await ctx.report_progress(15, 100, "获取现货价格...")
-    spot_data = pm_spot_prices.fn(symbol=sge_symbol, limit=10)
-
-    if ctx:
-        await ctx.report_progress(30, 100, "获取国际价格...")
-    intl_data = pm_international_prices.fn(symbol=intl_symbol)
-
-    if ctx:
-        await ctx.report_progress(45, 100, "获取ETF持仓...")
-    etf_data = pm_etf_holdings.fn(metal=metal, limit=10)
+        await ctx.report_progress(10, 100, "并行获取数据...")
+
+    # 六个数据源互不依赖，同时提交到线程池，总耗时约等于最慢的一次请求
+    loop = asyncio.get_running_loop()
+    tasks = [
+        loop.run_in_executor(None, partial(pm_spot_prices.fn, symbol=sge_symbol, limit=10, with_indicators=False)),
+        loop.run_in_executor(None, partial(pm_international_prices.fn, symbol=intl_symbol)),
+        loop.run_in_executor(None, partial(pm_etf_holdings.fn, metal=metal, limit=10)),
+        loop.run_in_executor(None, partial(pm_comex_inventory.fn, metal=metal_cn, limit=10)),
+        loop.run_in_executor(None, partial(pm_basis.fn, metal=metal_cn)),
+        loop.run_in_executor(None, partial(pm_benchmark_price.fn, metal=metal, limit=10)),
+    ]
 
     if ctx:
-        await ctx.report_progress(60, 100, "获取COMEX库存...")
-    comex_data = pm_comex_inventory.fn(metal=metal_cn, limit=10)
-
-    if ctx:
-        await ctx.report_progress(75, 100, "获取期现基差...")
-    basis_data = pm_basis.fn(metal=metal_cn)
-
-    if ctx:
-        await ctx.report_progress(90, 100, "获取基准价格...")
-    benchmark_data = pm_benchmark_price.fn(metal=metal, limit=10)
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            # 异常留给下方 gather 统一处理，这里只负责汇报进度
+            with suppress(Exception):
+                await task
+            await ctx.report_progress(10 + done * 13, 100, f"已获取 {done}/{len(tasks)} 项数据...")
+
+    # 单个数据源失败时以错误 CSV 代替，不影响其余部分
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    spot_data, intl_data, etf_data, comex_data, basis_data, benchmark_data = (
+        format_error_csv(str(result) or type(result).__name__, "akshare") if isinstance(result, Exception) else result
+        for result in results
+    )
 
     if ctx:
         await ctx.report_progress(100, 100, "诊断完成")
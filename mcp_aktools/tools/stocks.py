@@ -1,13 +1,12 @@
 from datetime import datetime, timedelta
 
-import akshare as ak
-import pandas as pd
 from fastmcp import Context
 from pydantic import Field
 
 from ..server import mcp
 from ..shared.fields import field_market, field_symbol
 from ..shared.indicators import add_technical_indicators
+from ..shared.lazy import ak, pd
 from ..shared.normalize import normalize_price_df
 from ..shared.utils import ak_cache, ak_search, ak_search_async
 
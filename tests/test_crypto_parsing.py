@@ -35,7 +35,8 @@ class TestCryptoParsing(unittest.TestCase):
                     ]
                 }
 
-        with mock.patch.object(crypto.requests, "get", return_value=_Resp()):
+        crypto._okx_funding_rate.cache_clear()
+        with mock.patch.object(crypto.SESSION, "get", return_value=_Resp()):
             out = crypto.okx_funding_rate.fn("BTC")
         self.assertIn("BTC", out)
         self.assertIn("当前费率", out)
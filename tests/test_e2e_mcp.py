@@ -424,8 +424,8 @@ class TestFunctionToolCallability:
         assert "pm_spot_prices.fn" in source, "pm_composite_diagnostic should use pm_spot_prices.fn"
         assert "cast(Callable" not in source, "Should not use cast(Callable...) pattern"
 
-    def test_draw_crypto_chart_uses_fn_attribute(self):
-        """Verify draw_crypto_chart uses .fn attribute."""
+    def test_draw_crypto_chart_uses_dataframe_helper(self):
+        """Verify draw_crypto_chart reads prices without a CSV round-trip."""
         import inspect
 
         tool = mcp._tool_manager._tools.get("draw_crypto_chart")
@@ -434,11 +434,11 @@ class TestFunctionToolCallability:
         assert callable(fn)
         source = inspect.getsource(fn)
 
-        assert "crypto_prices.fn" in source, "draw_crypto_chart should use crypto_prices.fn"
+        assert "_crypto_prices_df" in source, "draw_crypto_chart should use the DataFrame helper"
         assert "cast(Callable" not in source, "Should not use cast(Callable...) pattern"
 
-    def test_backtest_crypto_uses_fn_attribute(self):
-        """Verify backtest_crypto_strategy uses .fn attribute."""
+    def test_backtest_crypto_uses_dataframe_helper(self):
+        """Verify backtest_crypto_strategy reads prices without a CSV round-trip."""
         import inspect
 
         tool = mcp._tool_manager._tools.get("backtest_crypto_strategy")
@@ -447,7 +447,7 @@ class TestFunctionToolCallability:
         assert callable(fn)
         source = inspect.getsource(fn)
 
-        assert "crypto_prices.fn" in source, "backtest_crypto_strategy should use crypto_prices.fn"
+        assert "_crypto_prices_df" in source, "backtest_crypto_strategy should use the DataFrame helper"
         assert "cast(Callable" not in source, "Should not use cast(Callable...) pattern"
 
     def test_portfolio_view_uses_fn_attribute(self):
@@ -82,4 +82,8 @@ async def test_pm_composite_diagnostic_reports_progress():
         result = await pm_composite_diagnostic_fn(metal="gold", ctx=mock_ctx)
 
     assert mock_ctx.report_progress.call_count >= 7
+    # 100% must only be reported once, after the report is assembled
+    progress = [c.args[0] for c in mock_ctx.report_progress.call_args_list]
+    assert progress == sorted(progress)
+    assert progress.count(100) == 1
     assert "贵金属综合诊断" in result
@@ -0,0 +1,57 @@
+"""Tests for shared technical indicator helpers."""
+
+import pandas as pd
+import pytest
+
+from mcp_aktools.shared.indicators import add_technical_indicators, backtest_metrics, latch_positions
+
+
+class TestAddTechnicalIndicators:
+    """Test the indicator columns added to price frames."""
+
+    def test_adds_indicator_columns_in_place(self):
+        close = pd.Series([float(100 + i) for i in range(30)], index=range(10, 40))
+        df = pd.DataFrame({"收盘": close, "最低": close - 1, "最高": close + 1})
+
+        add_technical_indicators(df, df["收盘"], df["最低"], df["最高"])
+
+        for col in ["DIF", "DEA", "MACD", "KDJ.K", "KDJ.D", "KDJ.J", "RSI", "BOLL.M", "BOLL.U", "BOLL.L"]:
+            assert col in df.columns
+        assert df["RSI"].iloc[:13].isna().all()
+        assert df["RSI"].iloc[-1] == pytest.approx(100.0)
+        assert df["BOLL.M"].iloc[-1] == pytest.approx(close.iloc[-20:].mean())
+        assert df["DIF"].iloc[-1] > 0
+
+
+class TestLatchPositions:
+    """Test the vectorized position state machine."""
+
+    def test_holds_state_between_signals(self):
+        rsi = pd.Series([None, 25, 50, 75, 50, 20], dtype=float)
+
+        assert latch_positions(rsi < 30, rsi > 70).tolist() == [0, 1, 1, 0, 0, 1]
+
+
+class TestBacktestMetrics:
+    """Test the shared backtest return/drawdown/win-rate computation."""
+
+    def test_trades_on_previous_signal(self):
+        close = pd.Series([100.0, 110.0, 99.0, 108.9])
+        signal = pd.Series([1, 1, 0, 1])
+
+        cumulative_return, max_drawdown, win_rate = backtest_metrics(close, signal)
+
+        assert cumulative_return == pytest.approx(1.1 * 0.9 - 1)
+        assert max_drawdown == pytest.approx(-0.1)
+        assert win_rate == pytest.approx(0.5)
+
+    def test_no_trades_has_no_win_rate(self):
+        cumulative_return, max_drawdown, win_rate = backtest_metrics([1.0, 2.0, 3.0], [0, 0, 0])
+
+        assert cumulative_return == 0
+        assert max_drawdown == 0
+        assert win_rate is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
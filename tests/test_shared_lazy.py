@@ -0,0 +1,38 @@
+"""Tests for deferred heavy imports."""
+
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+from mcp_aktools.shared.lazy import LazyModule
+
+
+class TestLazyModule:
+    """Test the LazyModule proxy."""
+
+    def test_imports_on_first_attribute_access(self):
+        proxy = LazyModule("json")
+
+        assert "not loaded" in repr(proxy)
+        assert proxy.dumps({"a": 1}) == '{"a": 1}'
+        assert "not loaded" not in repr(proxy)
+
+    def test_patch_is_forwarded_to_real_module(self):
+        import json
+
+        proxy = LazyModule("json")
+        with mock.patch.object(proxy, "dumps", return_value="patched"):
+            assert json.dumps({}) == "patched"
+        assert json.dumps({}) == "{}"
+
+    def test_server_import_defers_heavy_modules(self):
+        code = "import sys, mcp_aktools; print(any(m in sys.modules for m in ('akshare', 'pandas')))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "False"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""Tests for shared normalization helpers."""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_aktools.shared.normalize import frame_to_csv, normalize_price_frame
+
+
+class TestFrameToCsv:
+    """Test the fast CSV serializer against pandas' own writer."""
+
+    def test_matches_pandas_for_price_frames(self):
+        df = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-01 08:00", "2024-01-01 12:00", None]),
+                "close": [42000.123456, np.nan, -0.0],
+                "volume": [1, 2, 3],
+                "amount": [None, None, None],
+                "currency": ["USDT", "USDT", "USDT"],
+                "source": ["okx", "a,b", 'say "hi"'],
+            }
+        )
+
+        expected = df.to_csv(index=False, float_format="%.4f").strip()
+        assert frame_to_csv(df, "%.4f") == expected
+
+    def test_date_only_values_drop_time(self):
+        df = pd.DataFrame({"date": pd.to_datetime(["2024-01-01", "2024-01-02"]), "rate": [7.1, 7.2]})
+
+        assert frame_to_csv(df, "%.2f") == "date,rate\n2024-01-01,7.10\n2024-01-02,7.20"
+
+    def test_falls_back_for_unsupported_columns(self):
+        df = pd.DataFrame({"value": [1.5, 2.5]})
+
+        assert frame_to_csv(df, "%.1f") == df.to_csv(index=False, float_format="%.1f").strip()
+
+    def test_falls_back_for_pd_na_in_object_columns(self):
+        df = pd.DataFrame({"a": pd.Series(["x", pd.NA], dtype=object), "b": [1.0, 2.0]})
+
+        assert frame_to_csv(df, "%.4f") == df.to_csv(index=False, float_format="%.4f", lineterminator="\n").strip()
+
+    def test_object_columns_blank_none_nan_and_nat(self):
+        df = pd.DataFrame({"a": pd.Series(["x", None, np.nan, pd.NaT], dtype=object), "b": [1.0, 2.0, 3.0, 4.0]})
+
+        assert frame_to_csv(df, "%.1f") == "a,b\nx,1.0\n,2.0\n,3.0\n,4.0"
+
+
+class TestNormalizePriceFrame:
+    """Test date handling in normalize_price_frame."""
+
+    def test_skips_parsing_datetime64_dates(self):
+        df = pd.DataFrame({"date": pd.to_datetime(["2024-01-01", "2024-01-02"]), "close": [1.0, 2.0]})
+
+        with mock.patch("pandas.to_datetime", wraps=pd.to_datetime) as to_datetime:
+            data = normalize_price_frame(df, {}, source="test", currency="CNY", limit=2)
+
+        to_datetime.assert_not_called()
+        assert data["date"].tolist() == df["date"].tolist()
+
+    def test_skips_sorting_ascending_dates(self):
+        df = pd.DataFrame({"date": pd.to_datetime(["2024-01-01", "2024-01-02"]), "close": [1.0, 2.0]})
+
+        with mock.patch.object(pd.DataFrame, "sort_values") as sort_values:
+            normalize_price_frame(df, {}, source="test", currency="CNY", limit=2)
+
+        sort_values.assert_not_called()
+
+    def test_sort_keeps_order_of_duplicate_dates(self):
+        days = pd.to_datetime(["2024-01-02", "2024-01-01"] * 50)
+        df = pd.DataFrame({"date": days, "close": [float(i) for i in range(100)]})
+
+        data = normalize_price_frame(df, {}, source="test", currency="CNY", limit=100)
+
+        assert data["close"].tolist() == [float(i) for i in range(1, 100, 2)] + [float(i) for i in range(0, 100, 2)]
+
+    def test_parses_string_dates(self):
+        df = pd.DataFrame({"date": ["2024-01-02", "2024-01-01"], "close": [2.0, 1.0]})
+
+        data = normalize_price_frame(df, {}, source="test", currency="CNY", limit=2)
+
+        assert data["date"].dtype.kind == "M"
+        assert data["close"].tolist() == [1.0, 2.0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
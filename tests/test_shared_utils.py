@@ -79,6 +79,47 @@ class TestAkCache:
         assert result2.equals(df)
         assert mock_fun.call_count == call_count  # No additional calls
 
+    def test_ak_cache_shares_inflight_fetch(self):
+        """Test that concurrent misses on one key trigger a single fetch."""
+        import threading
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        from mcp_aktools.shared import utils
+
+        df = pd.DataFrame({"col": [1, 2, 3]})
+        started = threading.Event()
+        waiting = threading.Event()
+        release = threading.Event()
+
+        class WatchedFuture(Future):
+            # Signals once a follower is blocked on the leader's result
+            def result(self, timeout=None):
+                waiting.set()
+                return super().result(timeout)
+
+        def slow_fun():
+            started.set()
+            release.wait(5)
+            return df
+
+        mock_fun = mock.Mock(side_effect=slow_fun)
+        key = f"test_ak_cache_inflight_{id(self)}"
+        CacheKey.init(key, 60).delete()
+
+        with mock.patch.object(utils, "Future", WatchedFuture), ThreadPoolExecutor(max_workers=2) as pool:
+            try:
+                leader = pool.submit(ak_cache, mock_fun, key=key, ttl=60)
+                assert started.wait(5)
+                follower = pool.submit(ak_cache, mock_fun, key=key, ttl=60)
+                assert waiting.wait(5), "follower never joined the in-flight fetch"
+            finally:
+                release.set()
+            results = [leader.result(5), follower.result(5)]
+
+        assert mock_fun.call_count == 1
+        assert all(r.equals(df) for r in results)
+        CacheKey.ALL[key].delete()
+
 
 class TestRecentTradeDate:
     """Test the recent_trade_date function."""
@@ -1,7 +1,9 @@
 """Tests for crypto module tools."""
 
+import json
 import pytest
 import pandas as pd
+from types import SimpleNamespace
 from unittest import mock
 
 # Import the module and access functions via .fn attribute
@@ -21,6 +23,58 @@ okx_oi_fn = crypto_module.okx_open_interest.fn
 fgi_fn = crypto_module.fear_greed_index.fn
 
 
+@pytest.fixture(autouse=True)
+def clear_http_caches():
+    """Reset the short-lived exchange response caches between tests."""
+    for fetch in (
+        crypto_module._okx_candle_frame,
+        crypto_module._okx_stat_rows,
+        crypto_module._okx_funding_rate,
+        crypto_module._okx_open_interest,
+        crypto_module._fear_greed_items,
+    ):
+        fetch.cache_clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def http(monkeypatch):
+    """Replace the shared exchange session once per test; tests set ``get``/``post`` behaviour."""
+    session = SimpleNamespace(get=mock.Mock(), post=mock.Mock())
+    monkeypatch.setattr(crypto_module, "SESSION", session)
+    return session
+
+
+def _response(payload=None, *, error=None, **attrs):
+    """Minimal stand-in for requests.Response: ``json()`` returns payload or raises error."""
+
+    def json_():
+        if error is not None:
+            raise error
+        return payload
+
+    return SimpleNamespace(json=json_, **attrs)
+
+
+def _price_frame(closes):
+    """Build a normalized price frame like the one from _crypto_prices_df."""
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=len(closes), freq="D"),
+            "open": [42000.0] * len(closes),
+            "high": [43000.0] * len(closes),
+            "low": [41500.0] * len(closes),
+            "close": [float(c) for c in closes],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def rising_prices():
+    """Thirty steadily rising closes, shared read-only by the strategy-validation tests."""
+    return _price_frame([42000 + i * 10 for i in range(30)])
+
+
 class TestSafeFloat:
     """Test _safe_float helper function."""
 
@@ -65,143 +119,274 @@ class TestSafeInt:
 class TestCryptoPrices:
     """Test the crypto_prices tool."""
 
-    def test_returns_csv_with_indicators(self):
+    def test_returns_csv_with_indicators(self, http):
         """Test that function returns price data with technical indicators."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": [
-                [
-                    "1704067200000",
-                    "42000.00",
-                    "42500.00",
-                    "43000.00",
-                    "41500.00",
-                    "100.00",
-                    "4200000.00",
-                    "4200000.00",
-                    "1",
-                ],
-                [
-                    "1704153600000",
-                    "42500.00",
-                    "43000.00",
-                    "43500.00",
-                    "42000.00",
-                    "150.00",
-                    "6375000.00",
-                    "6375000.00",
-                    "1",
-                ],
-            ]
-        }
+        mock_response = _response(
+            {
+                "data": [
+                    [
+                        "1704067200000",
+                        "42000.00",
+                        "42500.00",
+                        "43000.00",
+                        "41500.00",
+                        "100.00",
+                        "4200000.00",
+                        "4200000.00",
+                        "1",
+                    ],
+                    [
+                        "1704153600000",
+                        "42500.00",
+                        "43000.00",
+                        "43500.00",
+                        "42000.00",
+                        "150.00",
+                        "6375000.00",
+                        "6375000.00",
+                        "1",
+                    ],
+                ]
+            }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+        http.get.return_value = mock_response
+        result = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
 
-            assert isinstance(result, str)
-            assert "date" in result
-            assert "close" in result
+        assert isinstance(result, str)
+        assert "date" in result
+        assert "close" in result
 
-    def test_empty_response(self):
+    def test_empty_response(self, http):
         """Test handling of empty response."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
+        mock_response = _response({"data": []})
+
+        http.get.return_value = mock_response
+        result = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+
+        assert isinstance(result, str)
+        assert "error" in result
+
+    def test_tolerates_blank_numeric_fields(self, http):
+        """Test that blank OKX numeric fields become empty CSV cells instead of failing."""
+        mock_response = _response(
+            {
+                "data": [
+                    ["1704153600000", "42500.00", "43000.00", "42000.00", "42800.00", "", "", "", "1"],
+                    ["1704067200000", "42000.00", "42600.00", "41500.00", "42500.00", "100.00", "4200000.00", "0", "1"],
+                ]
+            }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+        http.get.return_value = mock_response
+        result = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+
+        lines = result.splitlines()
+        assert lines[1].startswith("2024-01-01,42000.0000")
+        assert lines[2].startswith("2024-01-02,42500.0000,43000.0000,42000.0000,42800.0000,,,USDT,okx")
+
+    def test_newest_first_candles_are_reversed_not_sorted(self, http):
+        """Test that OKX's newest-first order is fixed by a reverse, with no sort downstream."""
+        http.get.return_value = _response(
+            {
+                "data": [
+                    ["1704153600000", "42500.00", "43000.00", "42000.00", "42800.00", "1", "1", "0", "1"],
+                    ["1704067200000", "42000.00", "42600.00", "41500.00", "42500.00", "1", "1", "0", "1"],
+                ]
+            }
+        )
 
-            assert isinstance(result, str)
-            assert "error" in result
+        with mock.patch.object(pd.DataFrame, "sort_values") as sort_values:
+            frame = crypto_module._crypto_prices_df("BTC-USDT", "1H", 2)
+
+        sort_values.assert_not_called()
+        assert frame["date"].dtype.kind == "M"
+        assert frame["close"].tolist() == [42500.0, 42800.0]
+
+    def test_reuses_recent_candles(self, http):
+        """Test that sibling calls within the TTL share one OKX request."""
+        mock_response = _response(
+            {"data": [["1704067200000", "42000.00", "42600.00", "41500.00", "42500.00", "1", "1", "0", "1"]]}
+        )
+
+        http.get.return_value = mock_response
+        crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+        crypto_prices_fn(symbol="BTC-USDT", period="1h", limit=20)
+
+        assert http.get.call_count == 1
+
+    def test_does_not_cache_empty_candles(self, http):
+        """Test that an empty OKX payload is retried instead of cached for the TTL."""
+        candle = ["1704067200000", "42000.00", "42600.00", "41500.00", "42500.00", "1", "1", "0", "1"]
+        http.get.side_effect = [_response({"data": []}), _response({"data": [candle]})]
+
+        first = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+        second = crypto_prices_fn(symbol="BTC-USDT", period="1H", limit=2)
+
+        assert "error" in first
+        assert second.splitlines()[1].startswith("2024-01-01,42000.0000")
+        assert http.get.call_count == 2
+
+    def test_cached_frame_is_not_mutated_by_callers(self, http):
+        """Test that callers get their own slice of the shared indicator frame."""
+        mock_response = _response(
+            {
+                "data": [
+                    ["1704153600000", "42500.00", "43000.00", "42000.00", "42800.00", "1", "1", "0", "1"],
+                    ["1704067200000", "42000.00", "42600.00", "41500.00", "42500.00", "1", "1", "0", "1"],
+                ]
+            }
+        )
+
+        http.get.return_value = mock_response
+        first = crypto_module._crypto_prices_df("BTC-USDT", "1H", 2)
+        first["close"] = 0.0
+        second = crypto_module._crypto_prices_df("BTC-USDT", "1H", 2)
+
+        assert http.get.call_count == 1
+        assert second["close"].tolist() == [42500.0, 42800.0]
 
 
 class TestCryptoSentimentMetrics:
     """Test the crypto_sentiment_metrics tool."""
 
-    def test_returns_csv(self):
+    def test_returns_csv(self, http):
         """Test that function returns sentiment data."""
-        loan_response = mock.Mock()
-        loan_response.json.return_value = {
-            "data": [
-                ["1704067200000", "1.5"],
-                ["1704153600000", "1.6"],
-            ]
-        }
-        taker_response = mock.Mock()
-        taker_response.json.return_value = {
-            "data": [
-                ["1704067200000", "100.00", "150.00"],
-                ["1704153600000", "120.00", "180.00"],
-            ]
-        }
+        loan_response = _response(
+            {
+                "data": [
+                    ["1704067200000", "1.5"],
+                    ["1704153600000", "1.6"],
+                ]
+            }
+        )
+        taker_response = _response(
+            {
+                "data": [
+                    ["1704067200000", "100.00", "150.00"],
+                    ["1704153600000", "120.00", "180.00"],
+                ]
+            }
+        )
 
-        with mock.patch(
-            "mcp_aktools.tools.crypto.requests.get",
-            side_effect=[loan_response, taker_response],
-        ):
-            result = crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+        def route(url, **kwargs):
+            return loan_response if "loan-ratio" in url else taker_response
 
-            assert isinstance(result, str)
-            assert "时间" in result
-            assert "多空比" in result
-            assert "卖出量" in result
+        http.get.side_effect = route
+        result = crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+
+        assert isinstance(result, str)
+        assert "时间" in result
+        assert "多空比" in result
+        assert "卖出量" in result
+
+    def test_reuses_recent_stats(self, http):
+        """Test that repeated calls within the TTL skip both OKX requests."""
+        loan_response = _response({"data": [["1704067200000", "1.5"]]})
+        taker_response = _response({"data": [["1704067200000", "100.00", "150.00"]]})
+
+        def route(url, **kwargs):
+            return loan_response if "loan-ratio" in url else taker_response
+
+        http.get.side_effect = route
+        crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+        crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+
+        assert http.get.call_count == 2
+
+    def test_does_not_cache_empty_stats(self, http):
+        """Test that empty OKX stat payloads are retried instead of cached for the TTL."""
+        loan_response = _response({"data": [["1704067200000", "1.5"]]})
+        taker_response = _response({"data": [["1704067200000", "100.00", "150.00"]]})
+        loan_responses = iter([_response({}), loan_response])
+        taker_responses = iter([_response({"data": []}), taker_response])
+
+        def route(url, **kwargs):
+            return next(loan_responses if "loan-ratio" in url else taker_responses)
+
+        http.get.side_effect = route
+
+        first = crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+        second = crypto_sentiment_fn(symbol="BTC", period="1H", inst_type="SPOT")
+
+        assert "empty data" in first
+        assert "多空比" in second
+        assert http.get.call_count == 4
 
 
 class TestBinanceAiReport:
     """Test the binance_ai_report tool."""
 
-    def test_returns_report_text(self):
+    def test_returns_report_text(self, http):
         """Test that function returns AI report text."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": {
-                "report": {
-                    "translated": {
-                        "modules": [
-                            {"overview": "BTC Analysis", "points": [{"content": "Point 1"}]},
-                        ]
+        mock_response = _response(
+            {
+                "data": {
+                    "report": {
+                        "translated": {
+                            "modules": [
+                                {"overview": "BTC Analysis", "points": [{"content": "Point 1"}]},
+                            ]
+                        }
                     }
                 }
             }
-        }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.post", return_value=mock_response):
-            result = binance_ai_fn(symbol="BTC")
+        http.post.return_value = mock_response
+        result = binance_ai_fn(symbol="BTC")
 
-            assert isinstance(result, str)
-            assert "BTC" in result or "Point 1" in result or "Analysis" in result
+        assert isinstance(result, str)
+        assert "BTC" in result or "Point 1" in result or "Analysis" in result
 
-    def test_handles_invalid_json(self):
+    def test_handles_invalid_json(self, http):
         """Test handling of invalid JSON response."""
-        mock_response = mock.Mock()
-        mock_response.json.side_effect = Exception("Invalid JSON")
-        mock_response.text = "Some text response"
+        mock_response = _response(
+            error=Exception("Invalid JSON"), content=b"Some text response", text="Some text response"
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.post", return_value=mock_response):
-            result = binance_ai_fn(symbol="BTC")
+        http.post.return_value = mock_response
+        result = binance_ai_fn(symbol="BTC")
 
-            assert isinstance(result, str)
+        assert result == "Some text response"
+
+    def test_falls_back_to_raw_content(self, http):
+        """Test that a payload rejected by res.json() is parsed from raw bytes."""
+        payload = {"data": {"report": {"original": {"modules": [{"overview": "概览", "points": []}]}}}}
+        mock_response = _response(
+            error=ValueError("Invalid JSON"), content=b"\xef\xbb\xbf" + json.dumps(payload).encode()
+        )
+
+        http.post.return_value = mock_response
+        result = binance_ai_fn(symbol="BTC")
+
+        assert result == "概览"
 
 
 class TestCryptoCompositeDiagnostic:
     """Test the crypto_composite_diagnostic tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_composite_report(self):
+    async def test_returns_composite_report(self, monkeypatch):
         """Test that function returns a composite diagnostic report."""
         mock_prices = "date,open,high,low,close\n2024-01-01,42000,43000,41500,42500"
         mock_sentiment = "时间,多空比\n2024-01-01,1.5"
         mock_ai = "BTC AI Analysis Report"
 
-        with mock.patch("mcp_aktools.tools.crypto.crypto_prices", return_value=mock_prices):
-            with mock.patch("mcp_aktools.tools.crypto.crypto_sentiment_metrics", return_value=mock_sentiment):
-                with mock.patch("mcp_aktools.tools.crypto.binance_ai_report", return_value=mock_ai):
-                    result = await crypto_diag_fn(symbol="BTC")
+        # The composite calls each tool's .fn in the executor, so stub those directly
+        monkeypatch.setattr(crypto_module.crypto_prices, "fn", lambda *args, **kwargs: mock_prices)
+        monkeypatch.setattr(crypto_module.crypto_sentiment_metrics, "fn", lambda *args, **kwargs: mock_sentiment)
+        monkeypatch.setattr(crypto_module.binance_ai_report, "fn", lambda *args, **kwargs: mock_ai)
+        result = await crypto_diag_fn(symbol="BTC")
 
-                    assert isinstance(result, str)
-                    assert "加密货币综合诊断" in result
-                    assert "近期价格" in result
-                    assert "情绪指标" in result
-                    assert "币安AI报告" in result
+        assert isinstance(result, str)
+        assert "加密货币综合诊断" in result
+        assert "近期价格" in result
+        assert "情绪指标" in result
+        assert "币安AI报告" in result
+        assert mock_prices in result
+        assert mock_sentiment in result
+        assert mock_ai in result
 
 
 class TestDrawCryptoChart:
@@ -209,11 +394,9 @@ class TestDrawCryptoChart:
 
     def test_returns_ascii_chart(self):
         """Test that function returns an ASCII chart."""
-        mock_prices = "date,open,high,low,close\n" + "\n".join(
-            [f"2024-01-{i + 1:02d},42000,43000,41500,42500" for i in range(20)]
-        )
+        mock_prices = _price_frame([42500 + i * 10 for i in range(20)])
 
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=mock_prices):
             result = draw_crypto_chart_fn(symbol="BTC", bar="1D")
 
             assert isinstance(result, str)
@@ -223,7 +406,7 @@ class TestDrawCryptoChart:
 
     def test_handles_insufficient_data(self):
         """Test handling of insufficient data."""
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=""):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=None):
             result = draw_crypto_chart_fn(symbol="BTC", bar="1D")
 
             assert isinstance(result, str)
@@ -235,88 +418,71 @@ class TestBacktestCryptoStrategy:
 
     def test_sma_strategy(self):
         """Test SMA strategy backtest."""
-        mock_prices = "date,open,high,low,close\n" + "\n".join(
-            [f"2024-01-{i + 1:02d},42000,43000,41500,{42000 + i * 100}" for i in range(30)]
-        )
+        mock_prices = _price_frame([42000 + i * 100 for i in range(30)])
 
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=mock_prices):
             result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "策略回测" in result
             assert "累计收益" in result
             assert "最大回撤" in result
+            assert "2024-01-01" in result
 
-    def test_returns_not_found_when_crypto_prices_not_string(self):
-        """Test backtest when crypto_prices returns non-string."""
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=pd.DataFrame()):
-            result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
-
-            assert isinstance(result, str)
-            assert "未找到" in result
-
-    def test_parse_failure(self):
-        """Test backtest when price data cannot be parsed."""
-        bad_csv = 'date,close\n"unterminated'
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=bad_csv):
-            result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
-
-            assert isinstance(result, str)
-            assert "解析失败" in result
-
-    def test_empty_dataframe_after_parsing(self):
-        """Test backtest when parsed data is empty."""
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value="date,open,high,low,close\n"):
+    def test_empty_dataframe(self):
+        """Test backtest when the price frame is empty."""
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=_price_frame([])):
             result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "数据不足" in result
 
     def test_missing_close_column(self):
-        """Test backtest when '收盘' column is missing."""
-        mock_prices = "date,open,high,low\n2024-01-01,42000,43000,41500"
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        """Test backtest when 'close' column is missing."""
+        mock_prices = _price_frame([42000]).drop(columns=["close"])
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=mock_prices):
             result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "数据不足" in result
 
-    def test_rsi_strategy_missing_rsi_column(self):
+    def test_rsi_strategy_holds_between_thresholds(self):
+        """Test RSI strategy enters below 30 and holds until RSI exceeds 70."""
+        mock_prices = _price_frame([100, 100, 110, 121, 121, 60]).assign(rsi=[None, 25, 50, 60, 75, 50])
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=mock_prices):
+            result = backtest_crypto_fn(symbol="BTC", strategy="RSI", bar="4H", limit=30)
+
+            assert "RSI(30/70)" in result
+            assert "累计收益: 21.00%" in result
+            assert "胜率: 100.00%" in result
+
+    def test_rsi_strategy_missing_rsi_column(self, rising_prices):
         """Test RSI strategy when RSI column is missing."""
-        mock_prices = "date,open,high,low,close\n" + "\n".join(
-            [f"2024-01-{i + 1:02d},42000,43000,41500,{42000 + i * 10}" for i in range(30)]
-        )
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=rising_prices):
             result = backtest_crypto_fn(symbol="BTC", strategy="RSI", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "缺少 RSI" in result
 
-    def test_macd_strategy_missing_columns(self):
+    def test_macd_strategy_missing_columns(self, rising_prices):
         """Test MACD strategy when DIF/DEA columns are missing."""
-        mock_prices = "date,open,high,low,close\n" + "\n".join(
-            [f"2024-01-{i + 1:02d},42000,43000,41500,{42000 + i * 10}" for i in range(30)]
-        )
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=rising_prices):
             result = backtest_crypto_fn(symbol="BTC", strategy="MACD", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "缺少 MACD" in result
 
-    def test_invalid_strategy(self):
+    def test_invalid_strategy(self, rising_prices):
         """Test backtest with invalid strategy."""
-        mock_prices = "date,open,high,low,close\n" + "\n".join(
-            [f"2024-01-{i + 1:02d},42000,43000,41500,{42000 + i * 10}" for i in range(30)]
-        )
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=mock_prices):
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=rising_prices):
             result = backtest_crypto_fn(symbol="BTC", strategy="INVALID", bar="4H", limit=30)
 
             assert isinstance(result, str)
             assert "不支持" in result
 
     def test_returns_not_found_when_no_data(self):
-        """Test backtest returns not-found when crypto_prices is empty."""
-        with mock.patch.object(crypto_module.crypto_prices, "fn", return_value=""):
+        """Test backtest returns not-found when no candles are available."""
+        with mock.patch.object(crypto_module, "_crypto_prices_df", return_value=None):
             result = backtest_crypto_fn(symbol="BTC", strategy="SMA", bar="4H", limit=30)
             assert "未找到" in result
 
@@ -324,143 +490,153 @@ class TestBacktestCryptoStrategy:
 class TestOkxFundingRate:
     """Test the okx_funding_rate tool."""
 
-    def test_returns_funding_rate(self):
+    def test_returns_funding_rate(self, http):
         """Test that function returns funding rate data."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "fundingRate": "0.0001",
-                    "nextFundingRate": "0.0002",
-                    "fundingTime": "1704067200000",
-                }
-            ]
-        }
+        mock_response = _response(
+            {
+                "data": [
+                    {
+                        "fundingRate": "0.0001",
+                        "nextFundingRate": "0.0002",
+                        "fundingTime": "1704067200000",
+                    }
+                ]
+            }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_funding_fn(symbol="BTC")
+        http.get.return_value = mock_response
+        result = okx_funding_fn(symbol="BTC")
 
-            assert isinstance(result, str)
-            assert "资金费率" in result
-            assert "当前费率" in result
+        assert isinstance(result, str)
+        assert "资金费率" in result
+        assert "当前费率" in result
 
-    def test_handles_empty_fields(self):
+    def test_handles_empty_fields(self, http):
         """Test handling of empty fields in response."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "fundingRate": "",
-                    "nextFundingRate": "",
-                    "fundingTime": "",
-                }
-            ]
-        }
+        mock_response = _response(
+            {
+                "data": [
+                    {
+                        "fundingRate": "",
+                        "nextFundingRate": "",
+                        "fundingTime": "",
+                    }
+                ]
+            }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_funding_fn(symbol="BTC")
+        http.get.return_value = mock_response
+        result = okx_funding_fn(symbol="BTC")
 
-            assert isinstance(result, str)
-            assert "BTC" in result
+        assert isinstance(result, str)
+        assert "BTC" in result
 
-    def test_handles_no_items(self):
-        """Test funding rate when API returns no items."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
+    def test_does_not_cache_empty_payload(self, http):
+        """Test that an empty OKX payload is retried instead of cached for the TTL."""
+        item = {"fundingRate": "0.0001", "nextFundingRate": "0.0002", "fundingTime": "1704067200000"}
+        http.get.side_effect = [_response({}), _response({"data": [item]})]
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_funding_fn(symbol="BTC")
+        first = okx_funding_fn(symbol="BTC")
+        second = okx_funding_fn(symbol="BTC")
 
-            assert isinstance(result, str)
-            assert "未找到" in result
+        assert "未找到" in first
+        assert "当前费率: 0.0100%" in second
+        assert http.get.call_count == 2
 
 
 class TestOkxOpenInterest:
     """Test the okx_open_interest tool."""
 
-    def test_returns_open_interest(self):
+    def test_returns_open_interest(self, http):
         """Test that function returns open interest data."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "oi": "1000000",
-                    "oiCcy": "1000.00",
-                    "ts": "1704067200000",
-                }
-            ]
-        }
-
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_oi_fn(symbol="BTC")
-
-            assert isinstance(result, str)
-            assert "持仓量" in result
+        mock_response = _response(
+            {
+                "data": [
+                    {
+                        "oi": "1000000",
+                        "oiCcy": "1000.00",
+                        "ts": "1704067200000",
+                    }
+                ]
+            }
+        )
 
-    def test_handles_no_items(self):
-        """Test open interest when API returns no items."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
+        http.get.return_value = mock_response
+        result = okx_oi_fn(symbol="BTC")
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_oi_fn(symbol="BTC")
+        assert isinstance(result, str)
+        assert "持仓量" in result
 
-            assert isinstance(result, str)
-            assert "未找到" in result
+    def test_does_not_cache_empty_payload(self, http):
+        """Test that an empty OKX payload is retried instead of cached for the TTL."""
+        item = {"oi": "1000000", "oiCcy": "1000.00", "ts": "1704067200000"}
+        http.get.side_effect = [_response({}), _response({"data": [item]})]
 
-    def test_returns_not_found_when_empty(self):
-        """Test open interest handles empty data."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
+        first = okx_oi_fn(symbol="BTC")
+        second = okx_oi_fn(symbol="BTC")
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = okx_oi_fn(symbol="BTC")
-            assert "未找到" in result
+        assert "未找到" in first
+        assert "持仓量(张): 1,000,000" in second
+        assert http.get.call_count == 2
 
 
 class TestFearGreedIndex:
     """Test the fear_greed_index tool."""
 
-    def test_returns_index(self):
+    def test_returns_index(self, http):
         """Test that function returns fear & greed index."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "value": "75",
-                    "value_classification": "Greed",
-                    "timestamp": "1704067200",
-                }
-            ]
-            * 7
-        }
-
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = fgi_fn()
-
-            assert isinstance(result, str)
-            assert "恐惧贪婪指数" in result
-            assert "75" in result or "Greed" in result
-
-    def test_handles_no_items(self):
-        """Test fear_greed_index when API returns no items."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
-
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = fgi_fn()
-
-            assert isinstance(result, str)
-            assert "未能获取" in result
-
-    def test_handles_empty_response(self):
-        """Test fear_greed_index handles empty response."""
-        mock_response = mock.Mock()
-        mock_response.json.return_value = {"data": []}
+        mock_response = _response(
+            {
+                "data": [
+                    {
+                        "value": "75",
+                        "value_classification": "Greed",
+                        "timestamp": "1704067200",
+                    }
+                ]
+                * 7
+            }
+        )
 
-        with mock.patch("mcp_aktools.tools.crypto.requests.get", return_value=mock_response):
-            result = fgi_fn()
-            assert "未能获取" in result
+        http.get.return_value = mock_response
+        result = fgi_fn()
+
+        assert isinstance(result, str)
+        assert "恐惧贪婪指数" in result
+        assert "75" in result or "Greed" in result
+
+    def test_does_not_cache_empty_payload(self, http):
+        """Test that an empty response is retried instead of cached for the hour-long TTL."""
+        item = {"value": "75", "value_classification": "Greed", "timestamp": "1704067200"}
+        http.get.side_effect = [_response({}), _response({"data": [item]})]
+
+        first = fgi_fn()
+        second = fgi_fn()
+
+        assert "未能获取" in first
+        assert "当前指数: 75 (Greed)" in second
+        assert http.get.call_count == 2
+
+
+class TestEmptyExchangeData:
+    """Test the exchange tools when the API returns no items."""
+
+    @pytest.mark.parametrize(
+        ("tool", "kwargs", "expected"),
+        [
+            (okx_funding_fn, {"symbol": "BTC"}, "未找到"),
+            (okx_oi_fn, {"symbol": "BTC"}, "未找到"),
+            (fgi_fn, {}, "未能获取"),
+        ],
+        ids=["funding_rate", "open_interest", "fear_greed"],
+    )
+    def test_reports_missing_data(self, http, tool, kwargs, expected):
+        """Test that an empty data list yields the tool's not-found message."""
+        http.get.return_value = _response({"data": []})
+        result = tool(**kwargs)
+
+        assert isinstance(result, str)
+        assert expected in result
 
 
 if __name__ == "__main__":
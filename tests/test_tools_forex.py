@@ -10,20 +10,50 @@ fx_rates_fn = fx_module.fx_rates.fn
 fx_history_fn = fx_module.fx_history.fn
 
 
+@pytest.fixture(scope="module")
+def fx_rates_df():
+    """Spot quote table shaped like ak.fx_spot_quote; the tools only read it."""
+    return pd.DataFrame(
+        {
+            "货币对": ["USDCNY", "EURUSD", "USDJPY"],
+            "最新价": [7.2500, 1.0850, 148.50],
+            "涨跌幅": [0.15, -0.25, 0.35],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def fx_history_df():
+    """Daily history shaped like ak.fx_pair_quote."""
+    return pd.DataFrame(
+        {
+            "日期": ["2025-01-01", "2025-01-02", "2025-01-03"],
+            "开盘价": [7.2400, 7.2450, 7.2500],
+            "收盘价": [7.2450, 7.2500, 7.2550],
+            "最高价": [7.2500, 7.2550, 7.2600],
+            "最低价": [7.2350, 7.2400, 7.2450],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def fx_history_time_df():
+    """History variant that labels its timestamps with 时间."""
+    return pd.DataFrame(
+        {
+            "时间": ["2025-01-01 10:00", "2025-01-02 10:00"],
+            "开盘价": [7.2400, 7.2450],
+            "收盘价": [7.2450, 7.2500],
+        }
+    )
+
+
 class TestFxRates:
     """Test the fx_rates tool."""
 
-    def test_returns_csv(self):
+    def test_returns_csv(self, fx_rates_df):
         """Test that function returns spot rate data."""
-        mock_df = pd.DataFrame(
-            {
-                "货币对": ["USDCNY", "EURUSD", "USDJPY"],
-                "最新价": [7.2500, 1.0850, 148.50],
-                "涨跌幅": [0.15, -0.25, 0.35],
-            }
-        )
-
-        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=mock_df):
+        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=fx_rates_df):
             result = fx_rates_fn(symbol="USDCNY")
 
             assert isinstance(result, str)
@@ -43,19 +73,9 @@ class TestFxRates:
 class TestFxHistory:
     """Test the fx_history tool."""
 
-    def test_returns_csv(self):
+    def test_returns_csv(self, fx_history_df):
         """Test that function returns historical rate data."""
-        mock_df = pd.DataFrame(
-            {
-                "日期": ["2025-01-01", "2025-01-02", "2025-01-03"],
-                "开盘价": [7.2400, 7.2450, 7.2500],
-                "收盘价": [7.2450, 7.2500, 7.2550],
-                "最高价": [7.2500, 7.2550, 7.2600],
-                "最低价": [7.2350, 7.2400, 7.2450],
-            }
-        )
-
-        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=mock_df):
+        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=fx_history_df):
             result = fx_history_fn(symbol="USDCNY", limit=10)
 
             assert isinstance(result, str)
@@ -71,17 +91,9 @@ class TestFxHistory:
             assert isinstance(result, str)
             assert "error" in result
 
-    def test_handles_time_column(self):
+    def test_handles_time_column(self, fx_history_time_df):
         """Test handling when DataFrame has '时间' instead of '日期'."""
-        mock_df = pd.DataFrame(
-            {
-                "时间": ["2025-01-01 10:00", "2025-01-02 10:00"],
-                "开盘价": [7.2400, 7.2450],
-                "收盘价": [7.2450, 7.2500],
-            }
-        )
-
-        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=mock_df):
+        with mock.patch("mcp_aktools.tools.forex.ak_cache", return_value=fx_history_time_df):
             result = fx_history_fn(symbol="USDCNY", limit=10)
 
             assert isinstance(result, str)
@@ -268,7 +268,7 @@ class TestStockNewsGlobal:
             {"items": [{"title": "t1", "extra": {"hover": "h1", "info": "i1"}}]},
         ]
         with mock.patch.dict(os.environ, {"NEWSNOW_BASE_URL": "http://newstest"}, clear=False):
-            with mock.patch("mcp_aktools.tools.market.requests.post", return_value=mock_response):
+            with mock.patch("mcp_aktools.tools.market.SESSION.post", return_value=mock_response):
                 items = market_module.newsnow_news(channels=["a"])
         assert isinstance(items, list)
         assert len(items) >= 1
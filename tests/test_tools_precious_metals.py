@@ -49,6 +49,46 @@ class TestPmSpotPrices:
             assert isinstance(result, str)
             assert "error" in result
 
+    def test_can_skip_indicators(self):
+        """Test that with_indicators=False returns only the price columns."""
+        mock_df = pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-02", "2025-01-03"],
+                "open": [500.0, 501.0, 502.0],
+                "close": [501.0, 502.0, 503.0],
+                "high": [502.0, 503.0, 504.0],
+                "low": [499.0, 500.0, 501.0],
+            }
+        )
+
+        with mock.patch("mcp_aktools.tools.precious_metals.ak_cache", return_value=mock_df):
+            result = pm_spot_prices_fn(symbol="Au99.99", limit=2, with_indicators=False)
+
+        lines = result.splitlines()
+        assert lines[0] == "date,open,high,low,close,volume,amount,currency,source"
+        assert len(lines) == 3
+
+    def test_ordered_dates_are_not_sorted(self):
+        """Test that already ascending SGE history never pays for a sort."""
+        mock_df = pd.DataFrame(
+            {
+                "date": ["2025-01-01", "2025-01-02", "2025-01-03"],
+                "open": [500.0, 501.0, 502.0],
+                "close": [501.0, 502.0, 503.0],
+                "high": [502.0, 503.0, 504.0],
+                "low": [499.0, 500.0, 501.0],
+            }
+        )
+
+        with (
+            mock.patch("mcp_aktools.tools.precious_metals.ak_cache", return_value=mock_df),
+            mock.patch.object(pd.DataFrame, "sort_values") as sort_values,
+        ):
+            result = pm_spot_prices_fn(symbol="Au99.99", limit=3, with_indicators=False)
+
+        sort_values.assert_not_called()
+        assert result.splitlines()[1].startswith("2025-01-01,500.00")
+
     def test_handles_english_column_names(self):
         """Test handling of English column names from newer akshare API."""
         mock_df = pd.DataFrame(
@@ -109,6 +149,18 @@ class TestPmEtfHoldings:
             assert isinstance(result, str)
             assert "日期" in result or "持仓" in result
 
+    def test_dispatches_by_metal(self):
+        """Test that the metal name selects the akshare source case-insensitively."""
+        mock_df = pd.DataFrame({"日期": ["2025-01-01"], "持仓量": [1000.0]})
+
+        with mock.patch("mcp_aktools.tools.precious_metals.ak_cache", return_value=mock_df) as mock_cache:
+            pm_etf_holdings_fn(metal="Silver", limit=10)
+            result = pm_etf_holdings_fn(metal="copper", limit=10)
+
+        assert mock_cache.call_args_list[0].args[0].__name__ == "macro_cons_silver"
+        assert mock_cache.call_count == 1
+        assert "不支持" in result
+
 
 class TestPmComexInventory:
     """Test the pm_comex_inventory tool."""
@@ -220,3 +272,19 @@ class TestPmCompositeDiagnostic:
 
                                 assert isinstance(result, str)
                                 assert "贵金属综合诊断" in result
+
+    @pytest.mark.asyncio
+    async def test_failing_source_becomes_error_csv(self):
+        """Test that one raising data source does not abort the whole report."""
+        with (
+            mock.patch.object(pm_module.pm_spot_prices, "fn", return_value="spot_data"),
+            mock.patch.object(pm_module.pm_international_prices, "fn", side_effect=RuntimeError("timeout")),
+            mock.patch.object(pm_module.pm_etf_holdings, "fn", return_value="etf_data"),
+            mock.patch.object(pm_module.pm_comex_inventory, "fn", return_value="comex_data"),
+            mock.patch.object(pm_module.pm_basis, "fn", return_value="basis_data"),
+            mock.patch.object(pm_module.pm_benchmark_price, "fn", return_value="benchmark_data"),
+        ):
+            result = await pm_composite_diagnostic_fn(metal="gold", ctx=mock.AsyncMock())
+
+        assert "timeout,akshare," in result
+        assert "[上海基准价]\nbenchmark_data" in result